@@ -0,0 +1,30 @@
+"""add keyset pagination indexes
+
+Revision ID: 3f1c2a9b7e44
+Revises: ad9ca90953c1
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9b7e44'
+down_revision: Union[str, Sequence[str], None] = 'ad9ca90953c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_applications_created_at_id', 'applications', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_created_at_id', table_name='applications')
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
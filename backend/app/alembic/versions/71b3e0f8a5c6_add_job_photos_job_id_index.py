@@ -0,0 +1,28 @@
+"""add job photos job_id index
+
+Revision ID: 71b3e0f8a5c6
+Revises: e4d81b7c3f02
+Create Date: 2026-10-18 16:20:11.284703
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71b3e0f8a5c6'
+down_revision: Union[str, Sequence[str], None] = 'e4d81b7c3f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_job_photos_job_id_id', 'job_photos', ['job_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_photos_job_id_id', table_name='job_photos')
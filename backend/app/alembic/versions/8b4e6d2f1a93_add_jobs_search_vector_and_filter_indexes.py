@@ -0,0 +1,47 @@
+"""add jobs search vector and filter indexes
+
+Revision ID: 8b4e6d2f1a93
+Revises: 3f1c2a9b7e44
+Create Date: 2026-10-18 11:04:52.918310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6d2f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9b7e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(\"Requirements\", '') || ' ' || coalesce(\"Conditions_and_benefits\", '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR, persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_jobs_location', 'jobs', ['location'], unique=False)
+    op.create_index('ix_jobs_salary', 'jobs', ['salary'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_salary', table_name='jobs')
+    op.drop_index('ix_jobs_location', table_name='jobs')
+    op.drop_index('ix_jobs_search_vector', table_name='jobs')
+    op.drop_column('jobs', 'search_vector')
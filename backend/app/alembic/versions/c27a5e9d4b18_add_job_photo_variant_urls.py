@@ -0,0 +1,30 @@
+"""add job photo variant urls
+
+Revision ID: c27a5e9d4b18
+Revises: 8b4e6d2f1a93
+Create Date: 2026-10-18 12:31:07.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27a5e9d4b18'
+down_revision: Union[str, Sequence[str], None] = '8b4e6d2f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_photos', sa.Column('thumbnail_url', sa.String(), nullable=True))
+    op.add_column('job_photos', sa.Column('webp_url', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_photos', 'webp_url')
+    op.drop_column('job_photos', 'thumbnail_url')
@@ -0,0 +1,37 @@
+"""add application filter indexes
+
+Revision ID: e4d81b7c3f02
+Revises: 5a9f03c6e2d7
+Create Date: 2026-10-18 14:58:40.731562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4d81b7c3f02'
+down_revision: Union[str, Sequence[str], None] = '5a9f03c6e2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_applications_status_created_at', 'applications', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_applications_job_id_created_at', 'applications', ['job_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_applications_fio_trgm', 'applications', ['fio'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'fio': 'gin_trgm_ops'})
+    op.create_index('ix_applications_email_trgm', 'applications', ['email'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_email_trgm', table_name='applications')
+    op.drop_index('ix_applications_fio_trgm', table_name='applications')
+    op.drop_index('ix_applications_job_id_created_at', table_name='applications')
+    op.drop_index('ix_applications_status_created_at', table_name='applications')
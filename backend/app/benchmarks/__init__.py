@@ -0,0 +1 @@
+# Benchmark scripts package
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+Latency and throughput of the main endpoints against seeded local Postgres.
+
+The app runs in process (lifespan + httpx ASGITransport); S3, SMTP and the
+weather API are replaced with local stubs. --seed TRUNCATES jobs, photos,
+applications and the email outbox, so point it at a dedicated database.
+
+Run from backend/app:
+    python -m benchmarks.endpoint_bench --database-url postgresql+psycopg2://postgres@localhost/websearch_bench \\
+        --seed --preset medium --requests 2000 --concurrency 20 --output bench.json
+"""
+from collections import Counter
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import time
+
+
+PRESETS = {
+    'small': {'jobs': 10_000, 'photos': 3, 'applications': 10_000},
+    'medium': {'jobs': 10_000, 'photos': 3, 'applications': 100_000},
+    'large': {'jobs': 100_000, 'photos': 3, 'applications': 1_000_000},
+}
+
+DEFAULT_ADMIN_AUTH = ('bench', 'bench')
+
+SEED_STATEMENTS = [
+    'TRUNCATE applications, job_photos, jobs, email_outbox RESTART IDENTITY CASCADE',
+    """
+    INSERT INTO jobs (title, description, location, salary, created_at, "Requirements", "Conditions_and_benefits")
+    SELECT
+        'Вакансия ' || g,
+        repeat('Описание вакансии для нагрузочного теста. ', 20),
+        (ARRAY['Минск', 'Гродно', 'Брест', 'Гомель', 'Витебск', 'Могилёв'])[1 + g % 6],
+        800 + (g % 50) * 50,
+        now() - make_interval(secs => g),
+        repeat('Требования к кандидату. ', 10),
+        repeat('Условия и бонусы. ', 10)
+    FROM generate_series(1, :jobs) AS g
+    """,
+    """
+    INSERT INTO job_photos (job_id, url, thumbnail_url, webp_url)
+    SELECT
+        j,
+        'https://s3.bench/jobs/' || j || '-' || n || '.jpg',
+        'https://s3.bench/jobs/' || j || '-' || n || '.thumb.webp',
+        'https://s3.bench/jobs/' || j || '-' || n || '.webp'
+    FROM generate_series(1, :jobs) AS j, generate_series(1, :photos) AS n
+    """,
+    """
+    INSERT INTO applications (job_id, fio, email, phone, experience, created_at, status)
+    SELECT
+        1 + g % :jobs,
+        'Иванов Иван',
+        'user' || g || '@example.com',
+        '+375291234567',
+        'Опыт работы 3 года',
+        now() - make_interval(secs => g),
+        (ARRAY['pending', 'approved', 'rejected'])[1 + g % 3]
+    FROM generate_series(1, :applications) AS g
+    """,
+    'ANALYZE jobs, job_photos, applications',
+]
+
+
+class StubS3():
+    def __init__(self):
+        self.objects: dict[str, int] = {}
+
+    async def start(self):
+        return self
+
+    async def close(self):
+        pass
+
+    async def upload_content(self, key: str, content: bytes, content_type: str = None):
+        self.objects[key] = len(content)
+
+    async def upload_stream(self, key: str, stream, content_type: str = None, part_size: int = 0, max_size: int | None = None):
+        size = len(await stream.read())
+        self.objects[key] = size
+        return size
+
+    async def delete_files(self, files: list[str]):
+        for key in files:
+            self.objects.pop(key, None)
+        return {'deleted': len(files), 'errors': []}
+
+
+def async_database_url(database_url: str) -> str:
+    from sqlalchemy.engine import make_url
+    return make_url(database_url).set(drivername='postgresql+asyncpg').render_as_string(hide_password=False)
+
+
+def configure_environment(args):
+    # до импорта приложения: db.db и лимитер читают окружение при импорте.
+    # db.db сначала смотрит ASYNC_DATABASE_URL, поэтому задаются обе переменные,
+    # иначе --seed очистил бы базу из .env или окружения, а не --database-url
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['ASYNC_DATABASE_URL'] = async_database_url(args.database_url)
+    os.environ.setdefault('ADMIN_USERNAME', DEFAULT_ADMIN_AUTH[0])
+    os.environ.setdefault('ADMIN_PASSWORD', DEFAULT_ADMIN_AUTH[1])
+    os.environ['EMAIL_WORKER_ENABLED'] = 'false'
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    os.environ['DEBUG'] = 'false'
+
+
+def install_stubs():
+    import httpx
+    from services.s3.s3_interaction import s3_client
+    from services.email.send_email import smtp_sender
+    from services.weather_api.get_info_weather import weather_client
+
+    stub = StubS3()
+    for name in ('start', 'close', 'upload_content', 'upload_stream', 'delete_files'):
+        setattr(s3_client, name, getattr(stub, name))
+
+    async def send(message, login: str):
+        pass
+    smtp_sender.send = send
+
+    weather_client.transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={'current': {'temp_c': 12.0, 'condition': {'text': 'Ясно'}}})
+    )
+
+
+async def seed(volumes: dict):
+    from sqlalchemy import text
+    from db.db import engine
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        for statement in SEED_STATEMENTS:
+            await conn.execute(text(statement), volumes if ':' in statement else {})
+    return round(time.perf_counter() - started, 2)
+
+
+async def count_rows() -> dict:
+    from sqlalchemy import text
+    from db.db import engine
+
+    async with engine.connect() as conn:
+        return {
+            table: (await conn.execute(text(f'SELECT count(*) FROM {table}'))).scalar_one()
+            for table in ('jobs', 'job_photos', 'applications')
+        }
+
+
+def admin_auth() -> tuple[str, str]:
+    return os.environ['ADMIN_USERNAME'], os.environ['ADMIN_PASSWORD']
+
+
+def scenarios(counts: dict, pages: int, page_size: int):
+    auth = admin_auth()
+    jobs = max(counts['jobs'], 1)
+    job_pages = max(min(pages, counts['jobs'] // page_size), 1)
+    application_pages = max(min(pages, counts['applications'] // page_size), 1)
+
+    def main_jobs(client):
+        skip = random.randrange(job_pages) * page_size
+        return client.get('/main/jobs', params={'skip': skip, 'limit': page_size})
+
+    def apply(client):
+        job_id = random.randint(1, jobs)
+        return client.post(f'/main/apply/{job_id}', json={
+            'fio': 'Петров Пётр',
+            'email': f'bench{random.randrange(10**9)}@example.com',
+            'phone': '+375291234567',
+            'experience': 'Опыт работы 2 года',
+            'job_id': job_id,
+        })
+
+    def admin_applications(client):
+        skip = random.randrange(application_pages) * page_size
+        return client.get('/admin-panel/applications', params={'skip': skip, 'limit': page_size}, auth=auth)
+
+    return {
+        'GET /main/jobs': main_jobs,
+        'POST /main/apply/{job_id}': apply,
+        'GET /admin-panel/applications': admin_applications,
+    }
+
+
+def percentile(values: list[float], p: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[p - 1]
+
+
+async def run_scenario(client, make_request, requests: int, concurrency: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await make_request(client)
+
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await make_request(client)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': requests,
+        'errors': sum(count for status, count in statuses.items() if status >= 400),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput_rps': round(requests / elapsed, 1),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy.engine import make_url
+    from db.db import engine
+    from main import app
+
+    if engine.url != make_url(os.environ['ASYNC_DATABASE_URL']):
+        raise SystemExit(f'Движок подключён к {engine.url!r}, а не к --database-url, запуск остановлен')
+
+    install_stubs()
+    volumes = {**PRESETS[args.preset]}
+    for name in ('jobs', 'photos', 'applications'):
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+
+    report = {'revision': git_revision(), 'preset': args.preset, 'concurrency': args.concurrency}
+    if args.seed:
+        report['seed_seconds'] = await seed(volumes)
+
+    async with app.router.lifespan_context(app):
+        counts = await count_rows()
+        report['rows'] = counts
+        report['results'] = {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            for name, make_request in scenarios(counts, args.pages, args.page_size).items():
+                if args.only and name not in args.only:
+                    continue
+                report['results'][name] = await run_scenario(
+                    client, make_request, args.requests, args.concurrency, args.warmup
+                )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database-url', default=os.getenv('BENCH_DATABASE_URL', 'postgresql+psycopg2://postgres@localhost:5432/websearch_bench'))
+    parser.add_argument('--seed', action='store_true', help='очистить таблицы и заполнить их тестовыми данными')
+    parser.add_argument('--preset', choices=PRESETS, default='small')
+    parser.add_argument('--jobs', type=int)
+    parser.add_argument('--photos', type=int)
+    parser.add_argument('--applications', type=int)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--pages', type=int, default=50, help='сколько первых страниц списков запрашивать')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--only', action='append', help='запустить только указанный сценарий, например "GET /main/jobs"')
+    parser.add_argument('--output', help='файл для JSON отчёта')
+    parser.add_argument('--random-seed', type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.random_seed)
+    configure_environment(args)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Serialization cost of one job listing page, before and after typed response schemas.
+
+Run from backend/app:
+    python -m benchmarks.serialization_bench --jobs 20 --photos 3 --rounds 2000
+"""
+from datetime import datetime
+from typing import List
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from sqlalchemy.orm.attributes import set_committed_value
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from models.model import Jobs, JobPhoto
+from schemas.jobSchema import JobResponse
+from utils.serialization import render_json
+
+
+def make_jobs(count: int, photos: int) -> list[Jobs]:
+    jobs = []
+    for i in range(1, count + 1):
+        job = Jobs(
+            id=i,
+            title=f'Вакансия номер {i}',
+            description='Описание вакансии. ' * 40,
+            location='Минск',
+            salary=1500.0 + i,
+            created_at=datetime(2025, 1, 1, 12, 0, i % 60),
+            Requirements='Требования к кандидату. ' * 15,
+            Conditions_and_benefits='Условия и бонусы. ' * 15,
+        )
+        # как после selectin-загрузки: без обратной ссылки photo.job
+        set_committed_value(job, 'photos', [
+            JobPhoto(id=i * 100 + n, job_id=i, url=f'https://s3.example/jobs/{i}-{n}.jpg')
+            for n in range(photos)
+        ])
+        jobs.append(job)
+    return jobs
+
+
+def measure(fn, rounds: int) -> dict:
+    fn()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        size = len(fn())
+    elapsed = time.perf_counter() - started
+    return {'us_per_page': round(elapsed / rounds * 1e6, 1), 'bytes': size}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--photos', type=int, default=3)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs, args.photos)
+    adapter = TypeAdapter(List[JobResponse])
+    # то же поле ответа, что FastAPI строит для response_model=List[JobResponse]
+    field = create_model_field(name='Response_jobs', type_=List[JobResponse], mode='serialization')
+
+    def validated():
+        value, _ = field.validate(jobs, {}, loc=('response',))
+        return value
+
+    cases = {
+        # ORM-объекты без response_model: jsonable_encoder + JSONResponse.render
+        'before_jsonable_encoder_json': lambda: json.dumps(
+            jsonable_encoder(jobs), ensure_ascii=False, allow_nan=False, separators=(',', ':')
+        ).encode('utf-8'),
+        # response_model с классом ответа по умолчанию: FastAPI сериализует сразу в байты (dump_json)
+        'after_response_model_default': lambda: field.serialize_json(validated(), by_alias=True),
+        # промах кэша /main/jobs: схема + pydantic-core сразу в байты
+        'after_render_json': lambda: render_json(adapter, jobs),
+    }
+    if orjson is not None:
+        # response_model со своим классом ответа: FastAPI отдаёт dict, класс ответа рендерит его сам
+        cases['response_model_orjson_class'] = lambda: orjson.dumps(field.serialize(validated(), by_alias=True))
+
+    results = {name: measure(fn, args.rounds) for name, fn in cases.items()}
+    print(json.dumps({'jobs': args.jobs, 'photos': args.photos, 'rounds': args.rounds, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,9 @@
+
 from db.db import SessionLocal
 
-def get_db():
-    db = SessionLocal()
-    try:    
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 
@@ -0,0 +1,126 @@
+from contextlib import asynccontextmanager
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import time
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Время обработки HTTP запроса',
+    ['method', 'route'],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS = Counter('http_requests_total', 'Количество HTTP запросов', ['method', 'route', 'status'])
+HTTP_REQUESTS_IN_PROGRESS = Gauge('http_requests_in_progress', 'HTTP запросы в обработке', ['method'])
+
+DB_POOL_CHECKOUT = Histogram(
+    'db_pool_checkout_seconds',
+    'Ожидание соединения из пула SQLAlchemy',
+    buckets=DB_BUCKETS
+)
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Соединения, выданные из пула SQLAlchemy')
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Время выполнения SQL запроса',
+    ['statement'],
+    buckets=DB_BUCKETS
+)
+
+UPSTREAM_DURATION = Histogram(
+    'upstream_request_duration_seconds',
+    'Время запроса к внешнему сервису',
+    ['service', 'operation'],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_ERRORS = Counter('upstream_errors_total', 'Ошибки внешних сервисов', ['service', 'operation'])
+
+
+class MetricsMiddleware():
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # шаблон маршрута вместо пути, чтобы id не раздували число серий
+            route = scope.get('route')
+            route_path = getattr(route, 'path', None) or 'unmatched'
+            HTTP_REQUEST_DURATION.labels(method, route_path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine):
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_query_started', None)
+        if started is not None:
+            verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'UNKNOWN'
+            DB_QUERY_DURATION.labels(verb).observe(time.perf_counter() - started)
+
+
+def instrument_botocore(client, service: str):
+    def before_call(context, **kwargs):
+        context['metrics_started'] = time.perf_counter()
+
+    def after_call(context, event_name, **kwargs):
+        started = context.pop('metrics_started', None)
+        if started is not None:
+            UPSTREAM_DURATION.labels(service, event_name.rsplit('.', 1)[-1]).observe(time.perf_counter() - started)
+
+    def after_call_error(context, event_name, **kwargs):
+        after_call(context, event_name)
+        UPSTREAM_ERRORS.labels(service, event_name.rsplit('.', 1)[-1]).inc()
+
+    client.meta.events.register(f'before-call.{service}', before_call)
+    client.meta.events.register(f'after-call.{service}', after_call)
+    client.meta.events.register(f'after-call-error.{service}', after_call_error)
+
+
+@asynccontextmanager
+async def track_upstream(service: str, operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        UPSTREAM_DURATION.labels(service, operation).observe(time.perf_counter() - started)
@@ -0,0 +1,98 @@
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+import logging
+import os
+import time
+
+
+logger = logging.getLogger(__name__)
+
+DEBUG = os.getenv('DEBUG', 'false').lower() == 'true'
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+REPEATED_QUERY_THRESHOLD = int(os.getenv('REPEATED_QUERY_THRESHOLD', 5))
+
+
+class QueryStats():
+    def __init__(self, scope):
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get('route')
+        return getattr(route, 'path', None) or self.scope.get('path', '')
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.items() if count >= REPEATED_QUERY_THRESHOLD]
+
+
+request_query_stats: ContextVar[QueryStats | None] = ContextVar('request_query_stats', default=None)
+
+
+def instrument_query_stats(engine):
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._stats_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_stats_started', None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if duration * 1000 >= SLOW_QUERY_MS:
+            logger.warning(
+                'Медленный запрос %.1f мс (%s): %s',
+                duration * 1000,
+                stats.route if stats is not None else 'вне запроса',
+                ' '.join(statement.split())
+            )
+
+
+class QueryStatsMiddleware():
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = request_query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if DEBUG and message['type'] == 'http.response.start':
+                # учитываются запросы, выполненные до начала ответа
+                total = (time.perf_counter() - started) * 1000
+                server_timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", app;dur={total:.2f}'
+                message['headers'] = list(message.get('headers', [])) + [(b'server-timing', server_timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_query_stats.reset(token)
+            for statement, count in stats.repeated():
+                logger.warning(
+                    'Возможный N+1: запрос выполнен %s раз за один HTTP запрос (%s): %s',
+                    count,
+                    stats.route,
+                    ' '.join(statement.split())
+                )
@@ -1,26 +1,114 @@
 from crud.baseCrud import BaseCRUD
-from schemas.applicationSchema import ApplicationSchema
+from schemas.applicationSchema import ApplicationSchema, ApplicationFilterSchema
 from models.model import Applications, Jobs
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, func, insert, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 
 class ApplicationCRUD(BaseCRUD):
     def __init__(self):
         super().__init__(Applications)
 
-    def get_all(self, db: Session, skip: int, limit: int):
-        return db.query(self.model).options(joinedload(self.model.job)).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int, limit: int):
+        result = await db.execute(select(self.model).options(joinedload(self.model.job)).offset(skip).limit(limit))
+        return result.scalars().all()
 
-    def create(self, db: Session, obj_data: ApplicationSchema):
-        return super().create(db, obj_data)
+    async def get_page(self, db: AsyncSession, limit: int, cursor: str | None = None):
+        return await self.paginate(db, select(self.model).options(joinedload(self.model.job)), limit, cursor)
+
+    async def create(self, db: AsyncSession, obj_data: ApplicationSchema):
+        return await super().create(db, obj_data)
     
-    def update_status(self, db: Session, id, obj_data):
-        return self.update(db, id, obj_data)
+    async def create_many(self, db: AsyncSession, items: list[ApplicationSchema]):
+        # один многострочный INSERT ... RETURNING; commit делает вызывающий
+        result = await db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            [item.model_dump() for item in items]
+        )
+        return result.all()
+
+    async def update_status(self, db: AsyncSession, id, obj_data):
+        return await self.update(db, id, obj_data)
     
-    def filter_application(self, db: Session, obj_data):
-        return db.query(self.model).filter(self.model.status == obj_data).all()
+    async def bulk_update_status(self, db: AsyncSession, ids: list[int], status: str):
+        # один UPDATE ... RETURNING вместо SELECT + UPDATE + refresh на каждую заявку; commit делает вызывающий
+        result = await db.execute(
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(status=status)
+            .returning(self.model.id, self.model.email, self.model.fio)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
     
-    def counter_application(self, db: Session, id):
-        return db.query(self.model).filter(self.model.job_id == id).count()
+    def filter_conditions(self, filters: ApplicationFilterSchema):
+        conditions = []
+        if filters.status:
+            conditions.append(self.model.status == filters.status)
+        if filters.job_id is not None:
+            conditions.append(self.model.job_id == filters.job_id)
+        if filters.date_from:
+            conditions.append(self.model.created_at >= filters.date_from)
+        if filters.date_to:
+            conditions.append(self.model.created_at <= filters.date_to)
+        if filters.q:
+            conditions.append(or_(
+                self.model.fio.icontains(filters.q, autoescape=True),
+                self.model.email.icontains(filters.q, autoescape=True)
+            ))
+        return conditions
+
+    def filter_query(self, filters: ApplicationFilterSchema):
+        return select(self.model).where(*self.filter_conditions(filters))
+
+    async def filter_application(self, db: AsyncSession, filters: ApplicationFilterSchema, skip: int, limit: int):
+        query = self.filter_query(filters).options(joinedload(self.model.job))
+        result = await db.execute(query.order_by(self.model.created_at.desc(), self.model.id.desc()).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    async def filter_page(self, db: AsyncSession, filters: ApplicationFilterSchema, limit: int, cursor: str | None = None):
+        return await self.paginate(db, self.filter_query(filters).options(joinedload(self.model.job)), limit, cursor)
+    
+    async def stream_export(self, db: AsyncSession, filters: ApplicationFilterSchema, batch_size: int):
+        # строки вместо ORM-объектов и серверный курсор: в памяти не больше одной пачки
+        query = (
+            select(
+                self.model.id,
+                self.model.created_at,
+                self.model.status,
+                self.model.fio,
+                self.model.email,
+                self.model.phone,
+                self.model.experience,
+                self.model.job_id,
+                Jobs.title
+            )
+            .outerjoin(Jobs, Jobs.id == self.model.job_id)
+            .where(*self.filter_conditions(filters))
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield rows
+
+    async def counter_application(self, db: AsyncSession, id):
+        return await db.scalar(select(func.count()).select_from(self.model).where(self.model.job_id == id))
+
+    async def count_by_job(self, db: AsyncSession, job_ids: list[int]):
+        # один GROUP BY на всю страницу вакансий вместо COUNT(*) на каждую
+        counts = {job_id: {} for job_id in job_ids}
+        if not job_ids:
+            return counts
+
+        result = await db.execute(
+            select(self.model.job_id, self.model.status, func.count())
+            .where(self.model.job_id.in_(job_ids))
+            .group_by(self.model.job_id, self.model.status)
+        )
+        for job_id, status, count in result.all():
+            counts[job_id][status] = count
+        return counts
 
 applicationcrud = ApplicationCRUD()
\ No newline at end of file
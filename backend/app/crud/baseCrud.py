@@ -1,42 +1,70 @@
-from sqlalchemy.orm import Session
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.pagination import encode_cursor, decode_cursor
 
 class BaseCRUD():
     def __init__(self, model):
         self.model = model
 
-    def get(self, db: Session, id: int):
-        return db.query(self.model).filter(self.model.id == id).first()
+    async def get(self, db: AsyncSession, id: int):
+        result = await db.execute(select(self.model).where(self.model.id == id))
+        return result.scalars().first()
     
-    def get_all(self, db: Session, skip: int, limit: int):
-        return db.query(self.model).offset(skip).limit(limit).all()
+    async def get_all(self, db: AsyncSession, skip: int, limit: int):
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    async def get_page(self, db: AsyncSession, limit: int, cursor: str | None = None):
+        return await self.paginate(db, select(self.model), limit, cursor)
+
+    async def paginate(self, db: AsyncSession, query, limit: int, cursor: str | None = None, scalars: bool = True):
+        # keyset по (created_at, id): глубокие страницы не сканируют пропущенные строки
+        if limit < 1:
+            raise ValueError('Размер страницы должен быть больше нуля')
+        key = tuple_(self.model.created_at, self.model.id)
+        if cursor:
+            created_at, id = decode_cursor(cursor)
+            query = query.where(key < tuple_(created_at, id))
+
+        query = query.order_by(self.model.created_at.desc(), self.model.id.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        items = result.scalars().all() if scalars else result.all()
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+        return items, next_cursor
     
-    def create(self, db: Session, obj_data):
+    async def create(self, db: AsyncSession, obj_data):
         job_data = self.model(**obj_data.dict())
 
         db.add(job_data)
-        db.commit()
-        db.refresh(job_data)
+        await db.commit()
+        await db.refresh(job_data)
     
         return job_data
 
-    def update(self, db: Session, id: int, obj_data):
-        db_obj = self.get(db, id)
+    async def update(self, db: AsyncSession, id: int, obj_data):
+        db_obj = await self.get(db, id)
         update_data = obj_data.dict()
 
         if db_obj:
             for key, value in update_data.items():
                 setattr(db_obj, key, value)
 
-            db.commit()
-            db.refresh(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
 
         return db_obj
     
-    def delete(self, db: Session, id: int):
-        db_obj = self.get(db, id)
+    async def delete(self, db: AsyncSession, id: int):
+        db_obj = await self.get(db, id)
 
         if db_obj:
-            db.delete(db_obj)
-            db.commit()
+            await db.delete(db_obj)
+            await db.commit()
 
         return db_obj
\ No newline at end of file
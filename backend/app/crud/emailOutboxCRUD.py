@@ -0,0 +1,63 @@
+from crud.baseCrud import BaseCRUD
+from models.model import EmailOutbox
+from services.email.send_email import render_email
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+
+class EmailOutboxCRUD(BaseCRUD):
+    def __init__(self):
+        super().__init__(EmailOutbox)
+
+    def build(self, mail, solve, name, login):
+        subject, body = render_email(solve, name)
+        return EmailOutbox(recipient=mail, sender=login, subject=subject, body=body)
+
+    def enqueue(self, db: AsyncSession, mail, solve, name, login):
+        # письмо добавляется в транзакцию вызывающего, commit вместе со сменой статуса
+        message = self.build(mail, solve, name, login)
+        db.add(message)
+        return message
+
+    def add_many(self, db: AsyncSession, recipients, solve, login):
+        db.add_all([self.build(mail, solve, name, login) for mail, name in recipients])
+
+    async def claim_batch(self, db: AsyncSession, limit: int, lease_until: datetime):
+        # SKIP LOCKED: несколько воркеров не заберут одно и то же письмо.
+        # next_attempt_at сдвигается как аренда: после commit блокировки сняты, а если воркер
+        # упадёт во время отправки, письма вернутся в очередь, когда аренда истечёт
+        result = await db.execute(
+            select(self.model)
+            .where(self.model.status == 'pending', self.model.next_attempt_at <= datetime.now())
+            .order_by(self.model.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        messages = result.scalars().all()
+        for message in messages:
+            message.next_attempt_at = lease_until
+        return messages
+
+    async def mark_sent(self, db: AsyncSession, id: int):
+        await db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(status='sent', sent_at=datetime.now())
+        )
+
+    async def mark_failed(self, db: AsyncSession, id: int, attempts: int, error: str, next_attempt_at: datetime | None):
+        # без next_attempt_at попытки исчерпаны
+        values = {'attempts': attempts, 'last_error': error}
+        if next_attempt_at is None:
+            values['status'] = 'failed'
+        else:
+            values['next_attempt_at'] = next_attempt_at
+        await db.execute(update(self.model).where(self.model.id == id).values(**values))
+
+    async def count_by_status(self, db: AsyncSession):
+        result = await db.execute(select(self.model.status, func.count()).group_by(self.model.status))
+        return {status: count for status, count in result.all()}
+
+
+emailoutboxcrud = EmailOutboxCRUD()
\ No newline at end of file
@@ -1,39 +1,188 @@
 from crud.baseCrud import BaseCRUD
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, true
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.model import Jobs, JobPhoto
-from schemas.jobSchema import JobCreateSchema, JobUpdateSchema
+from schemas.jobSchema import JobCreateSchema, JobUpdateSchema, JobImportSchema, JobResponse, JobCardResponse, JobCardPage
+from utils.cache import TTLCache, MISSING
+from utils.serialization import render_json
+from utils.http_cache import with_etag
+from datetime import datetime
+from typing import List, Optional
+import os
+
+
+job_cache = TTLCache(
+    maxsize=int(os.getenv('JOB_CACHE_SIZE', 512)),
+    ttl=float(os.getenv('JOB_CACHE_TTL', 60)),
+)
+
+# кэшируются только типовые страницы, чтобы произвольные skip/limit/cursor не вытесняли горячие записи
+JOB_CACHE_PAGE_SIZES = {int(size) for size in os.getenv('JOB_CACHE_PAGE_SIZES', '10,20,50').split(',') if size.strip()}
+JOB_CACHE_MAX_SKIP = int(os.getenv('JOB_CACHE_MAX_SKIP', 1000))
+
+job_adapter = TypeAdapter(Optional[JobResponse])
+job_cards_adapter = TypeAdapter(List[JobCardResponse])
+job_card_page_adapter = TypeAdapter(JobCardPage)
 
 class JobCRUD(BaseCRUD):
     def __init__(self):
         super().__init__(Jobs)
     
-    def create_job(self, db: Session, job_data: JobCreateSchema):
-        photo_urls = job_data.photos if hasattr(job_data, "photos") else []
-        photo_objs = [JobPhoto(url=str(url)) for url in photo_urls]
+    async def create_job(self, db: AsyncSession, job_data: JobCreateSchema):
+        photos = job_data.photos if hasattr(job_data, "photos") else []
+        photo_objs = [
+            JobPhoto(url=photo) if isinstance(photo, str) else JobPhoto(**photo.model_dump())
+            for photo in photos
+        ]
 
         job_fields = job_data.model_dump(exclude={'photos'})
         job = Jobs(**job_fields)
         job.photos = photo_objs
 
         db.add(job)
-        db.commit()
-        db.refresh(job)
+        await db.commit()
+        await db.refresh(job)
 
         return job
 
-    def update_job(self, db: Session, id: int, job_data: JobUpdateSchema):
-        return super().update(db, id, job_data)
+    async def bulk_insert(self, db: AsyncSession, jobs: List[JobImportSchema], created_at: datetime) -> List[int]:
+        # id берутся из последовательности заранее, чтобы связать фото с вакансиями без RETURNING;
+        # COPY идёт в той же транзакции, commit делает вызывающий
+        result = await db.execute(
+            select(func.nextval(func.pg_get_serial_sequence('jobs', 'id')))
+            .select_from(func.generate_series(1, len(jobs)))
+        )
+        ids = result.scalars().all()
+
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+
+        await driver.copy_records_to_table(
+            'jobs',
+            columns=['id', 'title', 'description', 'location', 'salary', 'created_at', 'Requirements', 'Conditions_and_benefits'],
+            records=[
+                (id, job.title, job.description, job.location, job.salary, created_at, job.Requirements, job.Conditions_and_benefits)
+                for id, job in zip(ids, jobs)
+            ]
+        )
+
+        photos = [
+            (id, photo, None, None) if isinstance(photo, str) else (id, photo.url, photo.thumbnail_url, photo.webp_url)
+            for id, job in zip(ids, jobs)
+            for photo in job.photos
+        ]
+        if photos:
+            await driver.copy_records_to_table(
+                'job_photos',
+                columns=['job_id', 'url', 'thumbnail_url', 'webp_url'],
+                records=photos
+            )
+        return ids
+
+    async def update_job(self, db: AsyncSession, id: int, job_data: JobUpdateSchema):
+        return await super().update(db, id, job_data)
     
-    def remove_job(self, db: Session, id: int):
-        return super().delete(db, id)
+    async def remove_job(self, db: AsyncSession, id: int):
+        return await super().delete(db, id)
     
-    def get_job_photos_keys(self, db: Session, job_id: int):
-        photos = db.query(JobPhoto).filter(JobPhoto.job_id == job_id).all()
+    async def get_job_photos_keys(self, db: AsyncSession, job_id: int):
+        result = await db.execute(select(JobPhoto).where(JobPhoto.job_id == job_id))
+        photos = result.scalars().all()
         keys = []
         for photo in photos:
-            key = 'jobs/'+photo.url.split('/')[-1]
-            keys.append(key)
+            for url in (photo.url, photo.thumbnail_url, photo.webp_url):
+                if url:
+                    keys.append('jobs/'+url.split('/')[-1])
         return keys
+
+    def cards_query(self):
+        # только поля карточки и первое фото; описание и остальные фото грузятся в /jobs/{job_id}
+        first_photo = (
+            select(JobPhoto.url, JobPhoto.thumbnail_url)
+            .where(JobPhoto.job_id == Jobs.id)
+            .order_by(JobPhoto.id)
+            .limit(1)
+            .lateral('first_photo')
+        )
+        return (
+            select(
+                Jobs.id,
+                Jobs.title,
+                Jobs.location,
+                Jobs.salary,
+                Jobs.created_at,
+                first_photo.c.url.label('photo_url'),
+                first_photo.c.thumbnail_url,
+            )
+            .outerjoin(first_photo, true())
+        )
+
+    async def get_cards(self, db: AsyncSession, skip: int, limit: int):
+        result = await db.execute(self.cards_query().order_by(Jobs.id).offset(skip).limit(limit))
+        return result.all()
+
+    async def get_cards_page(self, db: AsyncSession, limit: int, cursor: str | None = None):
+        return await self.paginate(db, self.cards_query(), limit, cursor, scalars=False)
+
+    async def get_cached(self, db: AsyncSession, id: int) -> tuple[bytes, str]:
+        key = ('job', id)
+        value = job_cache.get(key)
+        if value is not MISSING:
+            return value
+
+        generation = job_cache.generation
+        job = await self.get(db, id)
+        value = with_etag(render_json(job_adapter, job))
+        # несуществующие id не кэшируются
+        if job is not None:
+            job_cache.set(key, value, generation)
+        return value
+
+    async def get_cards_cached(self, db: AsyncSession, skip: int, limit: int) -> tuple[bytes, str]:
+        async def load():
+            return with_etag(render_json(job_cards_adapter, await self.get_cards(db, skip, limit)))
+        if limit not in JOB_CACHE_PAGE_SIZES or skip % limit or skip > JOB_CACHE_MAX_SKIP:
+            return await load()
+        return await job_cache.get_or_load(('cards', skip, limit), load)
+
+    async def get_cards_page_cached(self, db: AsyncSession, limit: int, cursor: str | None = None) -> tuple[bytes, str]:
+        async def load():
+            jobs, next_cursor = await self.get_cards_page(db, limit, cursor)
+            return with_etag(render_json(job_card_page_adapter, {'items': jobs, 'next_cursor': next_cursor}))
+        # кэшируется только первая страница: курсоры произвольны, а дальние страницы дёшевы по индексу
+        if limit not in JOB_CACHE_PAGE_SIZES or cursor is not None:
+            return await load()
+        return await job_cache.get_or_load(('cards_page', limit, cursor), load)
+
+    async def search(
+            self,
+            db: AsyncSession,
+            q: str | None,
+            location: str | None,
+            salary_min: float | None,
+            salary_max: float | None,
+            skip: int,
+            limit: int):
+        query = select(Jobs)
+
+        if q:
+            ts_query = func.websearch_to_tsquery('russian', q)
+            rank = func.ts_rank_cd(Jobs.search_vector, ts_query)
+            query = query.where(Jobs.search_vector.bool_op('@@')(ts_query)).order_by(rank.desc(), Jobs.id.desc())
+        else:
+            query = query.order_by(Jobs.created_at.desc(), Jobs.id.desc())
+
+        if location:
+            query = query.where(Jobs.location == location)
+        if salary_min is not None:
+            query = query.where(Jobs.salary >= salary_min)
+        if salary_max is not None:
+            query = query.where(Jobs.salary <= salary_max)
+
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
     
 
 jobcrud = JobCRUD()
@@ -1,15 +1,54 @@
 from models.model import Settings
 from crud.baseCrud import BaseCRUD
-from sqlalchemy.orm import Session
-from schemas.settingsSchema import SettingSchema
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.settingsSchema import SettingSchema, SettingResponse
+from utils.http_cache import with_etag
+from utils.serialization import render_json
+from pydantic import TypeAdapter
+from typing import List
+import asyncio
 
 
 class SettingCRUD(BaseCRUD):
     def __init__(self):
         super().__init__(Settings)
 
-    def update_settings(self, db: Session, id, obj_data: SettingSchema):
-        return super().update(db, id, obj_data)
+    async def update_settings(self, db: AsyncSession, id, obj_data: SettingSchema):
+        return await super().update(db, id, obj_data)
     
 
-settingscrud = SettingCRUD()
\ No newline at end of file
+settingscrud = SettingCRUD()
+
+settings_adapter = TypeAdapter(List[SettingResponse])
+
+
+class SettingsCache():
+    def __init__(self):
+        self._settings = None
+        self._loaded = False
+        self.body, self.etag = with_etag(b'[]')
+        self._lock = asyncio.Lock()
+
+    async def load(self, db: AsyncSession):
+        settings = await settingscrud.get_all(db, 0, 1)
+        self.set(settings[0] if settings else None)
+
+    async def get(self, db: AsyncSession):
+        if not self._loaded:
+            async with self._lock:
+                if not self._loaded:
+                    await self.load(db)
+        return self._settings
+
+    async def get_response(self, db: AsyncSession) -> tuple[bytes, str]:
+        await self.get(db)
+        return self.body, self.etag
+
+    def set(self, settings: Settings | None):
+        self._settings = jsonable_encoder(settings) if settings is not None else None
+        self.body, self.etag = with_etag(render_json(settings_adapter, [settings] if settings is not None else []))
+        self._loaded = True
+
+
+settings_cache = SettingsCache()
\ No newline at end of file
@@ -1,10 +1,25 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from dotenv import load_dotenv
+from core.metrics import TimedAsyncAdaptedQueuePool, instrument_engine
+from core.query_stats import instrument_query_stats
 import os
 
 
 load_dotenv(encoding='UTF-8')
 DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql+psycopg2://webuser:webpass@db:5432/websearch')
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+ASYNC_DATABASE_URL = os.getenv(
+    'ASYNC_DATABASE_URL',
+    make_url(DATABASE_URL).set(drivername='postgresql+asyncpg').render_as_string(hide_password=False)
+)
+
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=int(os.getenv('DB_POOL_SIZE', 10)),
+    max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 20)),
+    pool_pre_ping=True,
+)
+instrument_engine(engine)
+instrument_query_stats(engine)
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
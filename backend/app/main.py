@@ -1,19 +1,65 @@
 from fastapi import FastAPI
+from utils.static_assets import make_static_app
 import uvicorn 
-from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+import logging
+import os
+
+from db.db import SessionLocal, engine
+from core.metrics import MetricsMiddleware
+from core.query_stats import QueryStatsMiddleware
+from crud.settingsCRUD import settings_cache
+from services.weather_api.get_info_weather import weather_client
+from services.s3.s3_interaction import s3_client
+from services.images.image_variants import start_pool, shutdown_pool
+from services.email.outbox_worker import outbox_worker
+from services.applications.application_batcher import application_batcher, APPLY_BATCHING
 
 from routers.user_routers.user_route import user_rout
 from routers.admin_routers.job_router import job_rout
 from routers.admin_routers.application_router import application_rout
 from routers.admin_routers.setting_router import setting_rout
 from routers.load_templates_routers.load_templates_router import template_rout
+from routers.metrics_routers.metrics_router import metrics_rout
+
+
+logger = logging.getLogger(__name__)
+
+EMAIL_WORKER_ENABLED = os.getenv('EMAIL_WORKER_ENABLED', 'true').lower() == 'true'
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with SessionLocal() as db:
+            await settings_cache.load(db)
+    except Exception as e:
+        logger.warning('Настройки сайта не загружены при старте: %s', e)
+    await weather_client.start()
+    await s3_client.start()
+    start_pool()
+    if EMAIL_WORKER_ENABLED:
+        outbox_worker.start()
+    if APPLY_BATCHING:
+        application_batcher.start()
+
+    yield
+
+    await application_batcher.stop()
+    await outbox_worker.stop()
+    shutdown_pool()
+    await s3_client.close()
+    await weather_client.close()
+    await engine.dispose()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 
-app.mount("/static", StaticFiles(directory='/app/frontend/src/static'), name="static")
-app.mount("/admin/static", StaticFiles(directory='/app/frontend/admin-panel/static'), name="admin-static")
+app.mount("/static", make_static_app('/app/frontend/src/static', '/static'), name="static")
+app.mount("/admin/static", make_static_app('/app/frontend/admin-panel/static', '/admin/static'), name="admin-static")
 
 
 app.include_router(user_rout)
@@ -21,6 +67,7 @@ app.include_router(job_rout)
 app.include_router(application_rout)
 app.include_router(setting_rout)
 app.include_router(template_rout)
+app.include_router(metrics_rout)
 
 
 if __name__ == '__main__':
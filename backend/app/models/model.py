@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Float, Text, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, relationship
 from datetime import datetime
 from typing import Optional, List
@@ -7,8 +8,20 @@ from typing import Optional, List
 class Base(DeclarativeBase):
     pass
 
+JOBS_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(\"Requirements\", '') || ' ' || coalesce(\"Conditions_and_benefits\", '')), 'C')"
+)
+
 class Jobs(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index('ix_jobs_created_at_id', 'created_at', 'id'),
+        Index('ix_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_jobs_location', 'location'),
+        Index('ix_jobs_salary', 'salary'),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
@@ -17,18 +30,31 @@ class Jobs(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
     Requirements: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     Conditions_and_benefits: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, Computed(JOBS_SEARCH_VECTOR, persisted=True), nullable=True, deferred=True)
     photos: Mapped[List["JobPhoto"]] = relationship("JobPhoto", back_populates="job", cascade="all, delete-orphan", lazy="selectin")
     applications: Mapped[List["Applications"]] = relationship('Applications', back_populates='job', cascade="all, delete-orphan", lazy="select")
 
 class JobPhoto(Base):
     __tablename__ = "job_photos"
+    __table_args__ = (
+        Index('ix_job_photos_job_id_id', 'job_id', 'id'),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     job_id: Mapped[int] = mapped_column(Integer, ForeignKey("jobs.id"), nullable=False)
     url: Mapped[str] = mapped_column(String, nullable=False)
+    thumbnail_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    webp_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     job: Mapped["Jobs"] = relationship("Jobs", back_populates="photos")
 
 class Applications(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index('ix_applications_created_at_id', 'created_at', 'id'),
+        Index('ix_applications_status_created_at', 'status', 'created_at', 'id'),
+        Index('ix_applications_job_id_created_at', 'job_id', 'created_at', 'id'),
+        Index('ix_applications_fio_trgm', 'fio', postgresql_using='gin', postgresql_ops={'fio': 'gin_trgm_ops'}),
+        Index('ix_applications_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     job_id: Mapped[int] = mapped_column(Integer, ForeignKey("jobs.id"), nullable=False)
     fio: Mapped[str] = mapped_column(String, nullable=False)
@@ -45,3 +71,20 @@ class Settings(Base):
     site_email: Mapped[str] = mapped_column(String, nullable=False, default='info@jobfinder.ru')
     site_phone: Mapped[str] = mapped_column(String, nullable=False, default='+7 (999) 123-45-67')
     site_adress: Mapped[str] = mapped_column(String, nullable=False, default='г. Москва, ул. Примерная, д. 123')
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index('ix_email_outbox_pending', 'next_attempt_at', postgresql_where=text("status = 'pending'")),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    recipient: Mapped[str] = mapped_column(String, nullable=False)
+    sender: Mapped[str] = mapped_column(String, nullable=False)
+    subject: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, default='pending')
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -1,30 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal, Optional, List, Union
 from utils.outh_admin import require_admin
 from core.db_dependencies import get_db
-from sqlalchemy.orm import Session
-from services.email.send_email import send_email_async
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.email.outbox_worker import outbox_worker
 
 from starlette.background import BackgroundTask
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse, FileResponse
+import os
 
 from crud.applicationCRUD import applicationcrud
-from crud.settingsCRUD import settingscrud
+from crud.settingsCRUD import settings_cache
+from crud.emailOutboxCRUD import emailoutboxcrud
+from services.export.applications_export import stream_csv, build_xlsx, export_filename
 
-from schemas.applicationSchema import GetStatusApplicationSchema
+from schemas.applicationSchema import GetStatusApplicationSchema, BulkStatusApplicationSchema, ApplicationFilterSchema
+from schemas.applicationSchema import ApplicationWithJobResponse, ApplicationPage
 
 
 application_rout = APIRouter(prefix='/admin-panel', dependencies=[Depends(require_admin)])
 
 
-@application_rout.get('/applications', tags=['admin-application'], summary='get all applications')
+@application_rout.get('/applications', tags=['admin-application'], summary='get all applications', response_model=Union[List[ApplicationWithJobResponse], ApplicationPage])
 async def get_all_applications(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 20):
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    pagination: Literal['offset', 'cursor'] = 'offset',
+    cursor: Optional[str] = None):
     try:
-        applications = applicationcrud.get_all(db, skip, limit)
+        if pagination == 'cursor' or cursor:
+            applications, next_cursor = await applicationcrud.get_page(db, limit, cursor)
+            return {'items': applications, 'next_cursor': next_cursor}
+
+        applications = await applicationcrud.get_all(db, skip, limit)
 
         return applications
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Ошибка получения заявок: {str(e)}')
     
@@ -32,36 +45,110 @@ async def get_all_applications(
 async def get_status_application(
     id: int,
     app_data: GetStatusApplicationSchema,
-    db: Session = Depends(get_db),
-    skip: int = 0, 
-    limit: int = 1):
+    db: AsyncSession = Depends(get_db)):
     try:
-        application = applicationcrud.update_status(db, id, app_data)
-        settings = settingscrud.get_all(db, skip, limit)
-        settings = settings[0]
-        login = settings.site_email
-        if not application:
+        settings = await settings_cache.get(db)
+        login = settings['site_email']
+        updated = await applicationcrud.bulk_update_status(db, [id], app_data.status)
+        if not updated:
             raise HTTPException(status_code=404, detail='Заявка не найдена!')
-        
-        solve = False
-        if app_data.status == 'approved':
-            solve = True
-        task = BackgroundTask(send_email_async, mail=application.email, solve=solve, name=application.fio, login=login)
+        application = updated[0]
+
+        solve = app_data.status == 'approved'
+        emailoutboxcrud.enqueue(db, mail=application.email, solve=solve, name=application.fio, login=login)
+        await db.commit()
+        outbox_worker.wake()
         return JSONResponse(
             {'message': f'Статус заявки успешно изменен на {app_data.status}'
-        }, background=task)
+        })
+
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f'Ошибка: {str(e)}')
     
+@application_rout.put('/applications/status', tags=['admin-application'], summary='bulk change applications status')
+async def bulk_status_applications(
+    app_data: BulkStatusApplicationSchema,
+    db: AsyncSession = Depends(get_db)):
+    try:
+        settings = await settings_cache.get(db)
+        login = settings['site_email']
+        updated = await applicationcrud.bulk_update_status(db, app_data.ids, app_data.status)
+
+        solve = app_data.status == 'approved'
+        emailoutboxcrud.add_many(db, [(row.email, row.fio) for row in updated], solve, login)
+        await db.commit()
+        outbox_worker.wake()
+
+        updated_ids = [row.id for row in updated]
+        return {
+            'message': f'Статус {len(updated_ids)} заявок изменен на {app_data.status}',
+            'updated': updated_ids,
+            'not_found': sorted(set(app_data.ids) - set(updated_ids))
+        }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f'Ошибка: {str(e)}')
     
-@application_rout.get('/applications/filter/{status}', tags=['admin-application'], summary='filter applications')
+@application_rout.get('/applications/filter', tags=['admin-application'], summary='filter applications with cursor pagination', response_model=ApplicationPage)
+async def search_applications(
+    filters: ApplicationFilterSchema = Depends(),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None):
+    try:
+        applications, next_cursor = await applicationcrud.filter_page(db, filters, limit, cursor)
+        return {'items': applications, 'next_cursor': next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f'Ошибка фильтрации: {str(e)}')
+
+@application_rout.get('/applications/export', tags=['admin-application'], summary='export filtered applications as csv or xlsx')
+async def export_applications(
+    filters: ApplicationFilterSchema = Depends(),
+    format: Literal['csv', 'xlsx'] = 'csv'):
+    if format == 'csv':
+        return StreamingResponse(
+            stream_csv(filters),
+            media_type='text/csv; charset=utf-8',
+            headers={'Content-Disposition': f'attachment; filename="{export_filename("csv")}"'}
+        )
+
+    try:
+        path = await build_xlsx(filters)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'Ошибка экспорта заявок: {str(e)}')
+    return FileResponse(
+        path,
+        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        filename=export_filename('xlsx'),
+        background=BackgroundTask(os.remove, path)
+    )
+
+@application_rout.get('/applications/filter/{status}', tags=['admin-application'], summary='filter applications', response_model=List[ApplicationWithJobResponse])
 async def filter_applications(
     status: str,
-    db: Session = Depends(get_db)):
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)):
     try:
-        applications = applicationcrud.filter_application(db, status)
+        applications = await applicationcrud.filter_application(db, ApplicationFilterSchema(status=status), skip, limit)
         return applications
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f'Ошибка фильтрации: {str(e)}')
\ No newline at end of file
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f'Ошибка фильтрации: {str(e)}')
+
+@application_rout.get('/email-outbox/stats', tags=['admin-application'], summary='email outbox queue depth and send latency')
+async def get_email_outbox_stats(db: AsyncSession = Depends(get_db)):
+    try:
+        return {
+            'queue': await emailoutboxcrud.count_by_status(db),
+            'worker': outbox_worker.stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'Ошибка получения статистики писем: {str(e)}')
\ No newline at end of file
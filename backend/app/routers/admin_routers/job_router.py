@@ -1,79 +1,125 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body, Form, Query
 from utils.outh_admin import require_admin
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.db_dependencies import get_db
-from uuid import uuid4
-from pathlib import Path
-from typing import List
-import asyncio
+from typing import List, Literal, Optional, Union
 
+from fastapi.encoders import jsonable_encoder
 from starlette.responses import JSONResponse
 
-from crud.jobCRUD import jobcrud
+from crud.jobCRUD import jobcrud, job_cache
 from crud.applicationCRUD import applicationcrud
 
-from schemas.jobSchema import JobCreateSchema, JobUpdateSchema
+from schemas.jobSchema import JobCreateSchema, JobUpdateSchema, JobResponse, JobWithCountsResponse, JobWithCountsPage
 
 from services.s3.s3_interaction import s3_client
+from services.s3.image_uploader import upload_images as upload_job_images, UPLOAD_MAX_FILES
+from services.job_import.job_import import import_jobs, detect_format
 
 
 job_rout = APIRouter(prefix='/admin-panel', dependencies=[Depends(require_admin)])
 
 
-@job_rout.get('/jobs', tags=['admin-job'], summary='get all jobs')
+async def attach_application_counts(db: AsyncSession, jobs):
+    counts = await applicationcrud.count_by_job(db, [job.id for job in jobs])
+    items = jsonable_encoder(jobs)
+    for item in items:
+        by_status = counts[item['id']]
+        item['application_counts'] = by_status
+        item['applications_total'] = sum(by_status.values())
+    return items
+
+
+@job_rout.get('/jobs', tags=['admin-job'], summary='get all jobs', response_model=Union[List[JobWithCountsResponse], JobWithCountsPage])
 async def get_all_jobs(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 20):
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    pagination: Literal['offset', 'cursor'] = 'offset',
+    cursor: Optional[str] = None,
+    with_counts: bool = False):
     try:
-        jobs = jobcrud.get_all(db, skip, limit)
+        if pagination == 'cursor' or cursor:
+            jobs, next_cursor = await jobcrud.get_page(db, limit, cursor)
+            if with_counts:
+                jobs = await attach_application_counts(db, jobs)
+            return {'items': jobs, 'next_cursor': next_cursor}
+
+        jobs = await jobcrud.get_all(db, skip, limit)
+        if with_counts:
+            jobs = await attach_application_counts(db, jobs)
         return jobs
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Ошибка получения вакансий: {str(e)}')
 
 @job_rout.post('/new_job', tags=['admin-job'], summary='create new job')
 async def create_job(
     job_data: JobCreateSchema,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        jobcrud.create_job(db, job_data)
+        await jobcrud.create_job(db, job_data)
+        job_cache.invalidate()
         return {
             "message": "Вакансия успешно создана"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f'Ошибка добавления вакансии: {str(e)}'
         )
     
+@job_rout.post('/jobs/import', tags=['admin-job'], summary='bulk import jobs from csv or ndjson')
+async def import_jobs_file(
+    file: UploadFile = File(...),
+    format: Optional[Literal['csv', 'ndjson']] = Form(None),
+    atomic: bool = Form(False),
+    db: AsyncSession = Depends(get_db)
+):
+    format = format or detect_format(file.filename, file.content_type)
+    if format is None:
+        raise HTTPException(status_code=400, detail='Не удалось определить формат файла, укажите csv или ndjson')
+    try:
+        result = await import_jobs(db, file.file, format, atomic)
+        if result['imported']:
+            job_cache.invalidate()
+        return result
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f'Ошибка импорта вакансий: {str(e)}')
+
 @job_rout.post('/upload-images', tags=['admin-job'], summary='upload images to s3')
 async def upload_images(photos: List[UploadFile] = File(...)):
-    urls = []
+    if len(photos) > UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f'Можно загрузить не более {UPLOAD_MAX_FILES} файлов за раз')
     try:
-        for file in photos:
-            ext = Path(file.filename).suffix
-            key = f"jobs/{uuid4()}{ext}"
-            content = await file.read()
-            asyncio.create_task(s3_client.upload_content(key, content, file.content_type))
-            url = f"{s3_client.config['endpoint_url'].rstrip('/')}/{s3_client.bucket_name}/{key}"
-            urls.append(url)
-        return JSONResponse({"urls": urls})
+        results = await upload_job_images(photos)
+        urls = [result['url'] for result in results if result['status'] == 'ok']
+        return JSONResponse({"urls": urls, "results": results})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка загрузки: {e}")
 
 @job_rout.post("/delete-images", tags=["admin-job"], summary='delete images from s3')
 async def delete_images(keys: List[str] = Body(...)):
-    asyncio.create_task(s3_client.delete_files(keys)) 
-    return JSONResponse({"deleted": len(keys)})
+    try:
+        result = await s3_client.delete_files(keys)
+        return JSONResponse(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка удаления: {e}")
+
 
 
+@job_rout.get('/cache/stats', tags=['admin-job'], summary='public job cache statistics')
+async def get_cache_stats():
+    return job_cache.stats()
 
-@job_rout.get('/jobs/{job_id}', tags=['admin-job'], summary='get job by id')
-async def get_job_by_id(job_id: int, db: Session = Depends(get_db)):
+@job_rout.get('/jobs/{job_id}', tags=['admin-job'], summary='get job by id', response_model=JobResponse)
+async def get_job_by_id(job_id: int, db: AsyncSession = Depends(get_db)):
     try:
-        job = jobcrud.get(db, job_id)
+        job = await jobcrud.get(db, job_id)
         if not job:
             raise HTTPException(status_code=404, detail='Вакансия не найдена')
         return job
@@ -83,41 +129,44 @@ async def get_job_by_id(job_id: int, db: Session = Depends(get_db)):
             detail=f'Ошибка получения вакансии: {str(e)}'
         )
 
-@job_rout.put('/jobs/{job_id}', tags=['admin-job'], summary='update job')
+@job_rout.put('/jobs/{job_id}', tags=['admin-job'], summary='update job', response_model=JobResponse)
 async def update_job(
     job_id: int,
     job_data: JobUpdateSchema,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        job = jobcrud.update_job(db, job_id, job_data)
+        job = await jobcrud.update_job(db, job_id, job_data)
         if not job:
             raise HTTPException(status_code=404, detail='Вакансия не найдена')
         
+        job_cache.invalidate()
         return job
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f'Ошибка обновления вакансии: {str(e)}'
         )
     
 @job_rout.delete('/jobs/{job_id}', tags=['admin-job'], summary='delete job')
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
+async def delete_job(job_id: int, db: AsyncSession = Depends(get_db)):
     try:
-        photo_keys = jobcrud.get_job_photos_keys(db, job_id)
+        photo_keys = await jobcrud.get_job_photos_keys(db, job_id)
 
+        failed_images = []
         if photo_keys:
-            await s3_client.delete_files(photo_keys)
+            failed_images = (await s3_client.delete_files(photo_keys))['errors']
 
-        job = jobcrud.remove_job(db, job_id)
+        job = await jobcrud.remove_job(db, job_id)
         
         if not job:
             raise HTTPException(status_code=404, detail='Вакансия не найдена')
         
-        return {"message": "Вакансия успешно удалена"}
+        job_cache.invalidate()
+        return {"message": "Вакансия успешно удалена", "failed_images": failed_images}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f'Ошибка удаления вакансии: {str(e)}'
@@ -1,25 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.db_dependencies import get_db
 from utils.outh_admin import require_admin
 
-from crud.settingsCRUD import settingscrud
+from crud.settingsCRUD import settingscrud, settings_cache
 
-from schemas.settingsSchema import SettingSchema
+from schemas.settingsSchema import SettingSchema, SettingResponse
+from typing import List
 
 
 setting_rout = APIRouter(prefix='/admin-panel', dependencies=[Depends(require_admin)])
 
 
-@setting_rout.get('/settings', tags=['admin-setting'], summary='get site settings')
+@setting_rout.get('/settings', tags=['admin-setting'], summary='get site settings', response_model=List[SettingResponse])
 async def get_settings(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 1):
+    db: AsyncSession = Depends(get_db)):
     try:
-        settings = settingscrud.get_all(db, skip, limit)
+        settings = await settings_cache.get(db)
         
-        return settings
+        return [settings] if settings else []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Ошибка получения настроек: {str(e)}')
 
@@ -27,26 +26,28 @@ async def get_settings(
 @setting_rout.put('/settings', tags=['admin-setting'], summary='update site settings')
 async def update_settings(
     setting_data: SettingSchema,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     skip: int =  0,
     limit: int = 10
 ):
     try:
-        all_settings = settingscrud.get_all(db, skip, limit)
+        all_settings = await settingscrud.get_all(db, skip, limit)
         
         if not all_settings:
-            settingscrud.create(db, setting_data)
+            created_settings = await settingscrud.create(db, setting_data)
+            settings_cache.set(created_settings)
             return {
                 "message": "Настройки созданы",
             }
         else:
             setting_id = all_settings[0].id
-            updated_settings = settingscrud.update_settings(db, setting_id, setting_data)
+            updated_settings = await settingscrud.update_settings(db, setting_id, setting_data)
+            settings_cache.set(updated_settings)
             return {
                 "message": "Настройки обновлены",
                 "data": updated_settings
             }
             
     except Exception as e: 
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f'Ошибка сохранения настроек: {str(e)}')
\ No newline at end of file
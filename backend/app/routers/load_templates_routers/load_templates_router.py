@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from utils.outh_admin import require_admin
+from utils.static_assets import STATIC_PRECOMPRESS, REVALIDATE_CACHE_CONTROL, html_shell
 from fastapi.responses import FileResponse
 import os
 
@@ -12,15 +13,25 @@ admin_templates_dir = '/app/frontend/admin-panel/templates'
 
 
 @template_rout.get("/", tags=['template'], summary='load main template')
-async def read_index():
+async def read_index(request: Request):
     index_path = os.path.join(templates_dir, "index.html")
+    if STATIC_PRECOMPRESS:
+        shell = html_shell(index_path)
+        if shell is None:
+            raise HTTPException(status_code=404, detail="Главная страница не найдена")
+        return shell.response(request.headers, REVALIDATE_CACHE_CONTROL)
     if not os.path.exists(index_path):
         raise HTTPException(status_code=404, detail="Главная страница не найдена")
     return FileResponse(index_path)
 
 @template_rout.get("/admin", tags=['template'], summary='load admin-panel tamplate', dependencies=[Depends(require_admin)])
-async def read_admin_panel():
+async def read_admin_panel(request: Request):
     admin_path = os.path.join(admin_templates_dir, "admin.html")
+    if STATIC_PRECOMPRESS:
+        shell = html_shell(admin_path)
+        if shell is None:
+            raise HTTPException(status_code=404, detail="Админ панель не найдена")
+        return shell.response(request.headers, REVALIDATE_CACHE_CONTROL)
     if not os.path.exists(admin_path):
         raise HTTPException(status_code=404, detail="Админ панель не найдена")
     return FileResponse(admin_path)
\ No newline at end of file
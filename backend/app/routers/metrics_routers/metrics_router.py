@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from core.metrics import DB_POOL_CHECKED_OUT
+from db.db import engine
+
+
+metrics_rout = APIRouter()
+
+
+@metrics_rout.get('/metrics', tags=['metrics'], summary='prometheus metrics', include_in_schema=False)
+async def get_metrics():
+    DB_POOL_CHECKED_OUT.set(engine.pool.checkedout())
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,68 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from typing import Literal, Optional, List, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.db_dependencies import get_db
 
 from crud.jobCRUD import jobcrud
 from crud.applicationCRUD import applicationcrud
-from crud.settingsCRUD import settingscrud
+from crud.settingsCRUD import settings_cache
 
-from schemas.applicationSchema import ApplicationSchema 
+from schemas.applicationSchema import ApplicationSchema, ApplicationResponse
+from schemas.jobSchema import JobResponse, JobCardResponse, JobCardPage
+from schemas.settingsSchema import SettingResponse
 from schemas.wetherSchema import WeatherSchema
 
-from services.weather_api.get_info_weather import get_weather
+from services.weather_api.get_info_weather import weather_client, WeatherAPIError
+from services.applications.application_batcher import application_batcher, APPLY_BATCHING
+
+from utils.http_cache import conditional_json_response
+from utils.rate_limit import apply_rate_limiter
 
 
 user_rout = APIRouter(prefix='/main')
 
+JOBS_CACHE_CONTROL = 'public, max-age=30, stale-while-revalidate=60'
+JOB_CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=300'
+SETTINGS_CACHE_CONTROL = 'public, max-age=300'
+
 
-@user_rout.get('/jobs', tags=['user'], summary='get all jobs')
+@user_rout.get('/jobs', tags=['user'], summary='get all jobs', response_model=Union[List[JobCardResponse], JobCardPage])
 async def get_all_jobs(
-    db: Session = Depends(get_db),
-    skip: int = 0, 
-    limit: int = 20):
-    jobs = jobcrud.get_all(db, skip, limit)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    pagination: Literal['offset', 'cursor'] = 'offset',
+    cursor: Optional[str] = None):
+    if pagination == 'cursor' or cursor:
+        try:
+            body, etag = await jobcrud.get_cards_page_cached(db, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return conditional_json_response(request, body, etag, JOBS_CACHE_CONTROL)
 
-    return jobs
+    body, etag = await jobcrud.get_cards_cached(db, skip, limit)
+
+    return conditional_json_response(request, body, etag, JOBS_CACHE_CONTROL)
+
+@user_rout.get('/jobs/search', tags=['user'], summary='search jobs', response_model=List[JobResponse])
+async def search_jobs(
+    db: AsyncSession = Depends(get_db),
+    q: Optional[str] = Query(None, max_length=200),
+    location: Optional[str] = None,
+    salary_min: Optional[float] = Query(None, ge=0),
+    salary_max: Optional[float] = Query(None, ge=0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)):
+    try:
+        jobs = await jobcrud.search(db, q, location, salary_min, salary_max, skip, limit)
+        return jobs
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'Ошибка поиска вакансий: {str(e)}')
 
 @user_rout.get('/weather-info/{latitude}/{longitude}', tags=['user'], summary='get data of weather')
-async def get_all_jobs(latitude: float,
-                       longitude: float):
-    result = await get_weather(f"{latitude} {longitude}")
+async def get_weather_info(latitude: float = Path(..., ge=-90, le=90),
+                           longitude: float = Path(..., ge=-180, le=180)):
+    try:
+        result = await weather_client.get_weather(latitude, longitude)
+    except WeatherAPIError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     return result
 
-@user_rout.get('/jobs/{job_id}', tags=['user'], summary='get job by id')
-async def get_job_by_id(job_id: int, db: Session = Depends(get_db)):
-    job = jobcrud.get(db, job_id)
+@user_rout.get('/jobs/{job_id}', tags=['user'], summary='get job by id', response_model=Optional[JobResponse])
+async def get_job_by_id(job_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    body, etag = await jobcrud.get_cached(db, job_id)
     
-    return job
+    return conditional_json_response(request, body, etag, JOB_CACHE_CONTROL)
 
-@user_rout.post('/apply/{job_id}', tags=['user'], summary='submit application')
+@user_rout.post('/apply/{job_id}', tags=['user'], summary='submit application', response_model=ApplicationResponse, dependencies=[Depends(apply_rate_limiter)])
 async def submit_application(
     job_id: int,
     application_data: ApplicationSchema,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         application_data.job_id = job_id
-        application = applicationcrud.create(db, application_data)
+        if APPLY_BATCHING:
+            application = await application_batcher.submit(application_data)
+        else:
+            application = await applicationcrud.create(db, application_data)
 
         return application
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f'Ошибка отправки заявки: {str(e)}'
         )
 
-@user_rout.get('/settings', tags=['user'], summary='get public site settings')
+@user_rout.get('/settings', tags=['user'], summary='get public site settings', response_model=List[SettingResponse])
 async def get_public_settings(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 1
+    request: Request,
+    db: AsyncSession = Depends(get_db)
     ):
     try:
-        settings = settingscrud.get_all(db, skip, limit)
-        return settings
+        body, etag = await settings_cache.get_response(db)
+        return conditional_json_response(request, body, etag, SETTINGS_CACHE_CONTROL)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Ошибка получения настроек: {str(e)}')
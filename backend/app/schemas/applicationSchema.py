@@ -1,7 +1,8 @@
-from pydantic import BaseModel, field_validator, EmailStr
+from pydantic import BaseModel, field_validator, EmailStr, Field, ConfigDict
 import re
-from typing import Optional
-from schemas.jobSchema import JobSchema
+from datetime import datetime
+from typing import Optional, List
+from schemas.jobSchema import JobSchema, JobResponse
 
 
 class ApplicationSchema(BaseModel):
@@ -52,4 +53,35 @@ class ApplicationSchema(BaseModel):
         return v
     
 class GetStatusApplicationSchema(BaseModel):
-    status: str
\ No newline at end of file
+    status: str
+
+class BulkStatusApplicationSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+    status: str
+
+class ApplicationFilterSchema(BaseModel):
+    status: Optional[str] = None
+    job_id: Optional[int] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    q: Optional[str] = Field(None, max_length=200)
+
+
+class ApplicationResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    job_id: int
+    fio: str
+    email: str
+    phone: str
+    experience: Optional[str] = None
+    created_at: datetime
+    status: str
+
+class ApplicationWithJobResponse(ApplicationResponse):
+    job: Optional[JobResponse] = None
+
+class ApplicationPage(BaseModel):
+    items: List[ApplicationWithJobResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
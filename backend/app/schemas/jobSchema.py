@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List, Union, Dict
+from datetime import datetime
 
 
 class JobSchema(BaseModel):
@@ -10,8 +11,62 @@ class JobSchema(BaseModel):
     Requirements: Optional[str] = None
     Conditions_and_benefits: Optional[str] = None
 
+class JobPhotoSchema(BaseModel):
+    url: str
+    thumbnail_url: Optional[str] = None
+    webp_url: Optional[str] = None
+
 class JobCreateSchema(JobSchema):
-    photos: List[str]
+    photos: List[Union[JobPhotoSchema, str]]
 
 class JobUpdateSchema(JobSchema):
-    pass
\ No newline at end of file
+    pass
+
+class JobImportSchema(JobSchema):
+    photos: List[Union[JobPhotoSchema, str]] = []
+
+
+class JobPhotoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    job_id: int
+    url: str
+    thumbnail_url: Optional[str] = None
+    webp_url: Optional[str] = None
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    description: str
+    location: str
+    salary: float
+    created_at: datetime
+    Requirements: Optional[str] = None
+    Conditions_and_benefits: Optional[str] = None
+    photos: List[JobPhotoResponse] = []
+
+class JobCardResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    location: str
+    salary: float
+    created_at: datetime
+    photo_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+
+class JobCardPage(BaseModel):
+    items: List[JobCardResponse]
+    next_cursor: Optional[str] = None
+
+class JobWithCountsResponse(JobResponse):
+    application_counts: Optional[Dict[str, int]] = None
+    applications_total: Optional[int] = None
+
+class JobWithCountsPage(BaseModel):
+    items: List[JobWithCountsResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, field_validator, Field
+from pydantic import BaseModel, EmailStr, field_validator, Field, ConfigDict
 import re
 
 
@@ -18,4 +18,13 @@ class SettingSchema(BaseModel):
         if not re.match(r'^(\+375|80)(25|29|33|44|17)\d{7}$', clean_phone):
             raise ValueError('Некорректный номер телефона. Используйте белорусский формат: +375 XX XXX-XX-XX')
         
-        return v.strip()
\ No newline at end of file
+        return v.strip()
+
+
+class SettingResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    site_email: str
+    site_phone: str
+    site_adress: str
\ No newline at end of file
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+
+from db.db import SessionLocal
+from crud.applicationCRUD import applicationcrud
+from schemas.applicationSchema import ApplicationSchema
+
+
+logger = logging.getLogger(__name__)
+
+APPLY_BATCHING = os.getenv('APPLY_BATCHING', 'false').lower() == 'true'
+
+
+class ApplicationBatcher():
+    def __init__(self, max_size: int = 50, max_delay: float = 0.005):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.batches = 0
+        self.fallbacks = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # None в очереди - сигнал дописать текущую пачку и завершиться, не обрывая запись
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                pending.append(item)
+        if pending:
+            await self._flush(pending)
+
+    async def submit(self, application: ApplicationSchema):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((application, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.exception('Ошибка записи пачки заявок')
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _flush(self, batch: list):
+        async with SessionLocal() as db:
+            try:
+                applications = await applicationcrud.create_many(db, [application for application, _ in batch])
+                await db.commit()
+            except Exception as e:
+                # одна плохая заявка (например, несуществующая вакансия) не должна ронять остальные
+                await db.rollback()
+                self.fallbacks += 1
+                logger.warning('Пачка из %s заявок не записана, записываем по одной: %s', len(batch), getattr(e, 'orig', e))
+                await self._insert_one_by_one(db, batch)
+                return
+
+        self.batches += 1
+        for (_, future), application in zip(batch, applications):
+            if not future.done():
+                future.set_result(application)
+
+    async def _insert_one_by_one(self, db, batch: list):
+        for application, future in batch:
+            try:
+                result = await applicationcrud.create(db, application)
+            except Exception as e:
+                await db.rollback()
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
+application_batcher = ApplicationBatcher(
+    max_size=int(os.getenv('APPLY_BATCH_MAX_SIZE', 50)),
+    max_delay=float(os.getenv('APPLY_BATCH_MAX_DELAY_MS', 5)) / 1000,
+)
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import time
+
+from db.db import SessionLocal
+from crud.emailOutboxCRUD import emailoutboxcrud
+from services.email.send_email import SMTPSender, smtp_sender, build_message
+
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker():
+    def __init__(
+            self,
+            sender: SMTPSender,
+            batch_size: int = 50,
+            poll_interval: float = 5,
+            max_attempts: int = 5,
+            backoff_base: float = 30,
+            backoff_max: float = 3600,
+            lease_seconds: float = 600):
+        self.sender = sender
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.sent = 0
+        self.failed = 0
+        self.send_seconds_total = 0.0
+        self.last_send_seconds: float | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.sender.close()
+
+    def wake(self):
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                logger.exception('Ошибка обработки очереди писем')
+                processed = 0
+
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def process_batch(self):
+        # короткая транзакция только на захват: соединение и блокировки не держатся во время SMTP
+        async with SessionLocal() as db:
+            lease_until = datetime.now() + timedelta(seconds=self.lease_seconds)
+            messages = await emailoutboxcrud.claim_batch(db, self.batch_size, lease_until)
+            await db.commit()
+
+        for message in messages:
+            started = time.perf_counter()
+            try:
+                await self.sender.send(
+                    build_message(message.recipient, message.sender, message.subject, message.body),
+                    message.sender
+                )
+            except Exception as e:
+                await self._retry_later(message, e)
+                continue
+
+            elapsed = time.perf_counter() - started
+            self.sent += 1
+            self.send_seconds_total += elapsed
+            self.last_send_seconds = elapsed
+            async with SessionLocal() as db:
+                await emailoutboxcrud.mark_sent(db, message.id)
+                await db.commit()
+
+        return len(messages)
+
+    async def _retry_later(self, message, error: Exception):
+        attempts = message.attempts + 1
+        next_attempt_at = None
+        if attempts >= self.max_attempts:
+            self.failed += 1
+            logger.error('Письмо %s не отправлено после %s попыток: %s', message.id, attempts, error)
+        else:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+            next_attempt_at = datetime.now() + timedelta(seconds=delay)
+
+        async with SessionLocal() as db:
+            await emailoutboxcrud.mark_failed(db, message.id, attempts, str(error), next_attempt_at)
+            await db.commit()
+
+    def stats(self):
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'avg_send_seconds': round(self.send_seconds_total / self.sent, 4) if self.sent else None,
+            'last_send_seconds': round(self.last_send_seconds, 4) if self.last_send_seconds is not None else None,
+        }
+
+
+outbox_worker = OutboxWorker(
+    sender=smtp_sender,
+    batch_size=int(os.getenv('EMAIL_BATCH_SIZE', 50)),
+    poll_interval=float(os.getenv('EMAIL_POLL_INTERVAL', 5)),
+    max_attempts=int(os.getenv('EMAIL_MAX_ATTEMPTS', 5)),
+    backoff_base=float(os.getenv('EMAIL_BACKOFF_BASE', 30)),
+    backoff_max=float(os.getenv('EMAIL_BACKOFF_MAX', 3600)),
+    lease_seconds=float(os.getenv('EMAIL_LEASE_SECONDS', 600)),
+)
\ No newline at end of file
@@ -2,42 +2,90 @@ import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-import aiofiles
 from pathlib import Path
 
-async def send_email_async(mail, solve, name, login):
-    smtp_server = "smtp.mail.ru"
-    smtp_port = 465
-    password = os.getenv('ADMIN_MAIL_PASSWORD')
+from core.metrics import track_upstream
 
-    base_dir = Path(__file__).parent.parent
-    templates_dir = base_dir / 'templates' / 'email_template'
 
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / 'templates' / 'email_template'
+
+
+def load_templates():
+    return {
+        name: (TEMPLATES_DIR / f'{name}.txt').read_text(encoding='utf-8')
+        for name in ('approved', 'rejected')
+    }
+
+
+# шаблоны читаются один раз при импорте, а не на каждое письмо
+TEMPLATES = load_templates()
+
+
+def render_email(solve, name):
+    if solve:
+        return f'Собеседование. Здравствуйте, {name}!', TEMPLATES['approved']
+    return f'Отказ. Здравствуйте, {name}!', TEMPLATES['rejected']
+
+
+def build_message(mail, login, subject, body):
     msg = MIMEMultipart()
     msg['From'] = login
     msg['To'] = mail
-
-    if solve:
-        msg['Subject'] = f'Собеседование. Здравствуйте, {name}!'
-        template_path = templates_dir / 'approved.txt'
-    else:
-        msg['Subject'] = f'Отказ. Здравствуйте, {name}!'
-        template_path = templates_dir / 'rejected.txt'
-
-    async with aiofiles.open(template_path, 'r', encoding='utf-8') as f:
-        body = await f.read()
-    
+    msg['Subject'] = subject
     msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+class SMTPSender():
+    def __init__(
+            self,
+            hostname: str,
+            port: int,
+            password: str | None,
+            use_tls: bool = True,
+            timeout: float = 30):
+        self.hostname = hostname
+        self.port = port
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp: aiosmtplib.SMTP | None = None
+        self._login: str | None = None
+
+    async def _connect(self, login: str):
+        await self.close()
+        smtp = aiosmtplib.SMTP(hostname=self.hostname, port=self.port, use_tls=self.use_tls, timeout=self.timeout)
+        await smtp.connect()
+        if self.password:
+            await smtp.login(login, self.password)
+        self._smtp = smtp
+        self._login = login
+
+    async def send(self, message, login: str):
+        # соединение держится открытым между письмами и переоткрывается при обрыве или смене отправителя
+        async with track_upstream('smtp', 'send_message'):
+            if self._smtp is None or not self._smtp.is_connected or self._login != login:
+                await self._connect(login)
+            try:
+                await self._smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self._connect(login)
+                await self._smtp.send_message(message)
+
+    async def close(self):
+        if self._smtp is not None:
+            try:
+                await self._smtp.quit()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+            self._smtp = None
+            self._login = None
+
 
-    try:
-        await aiosmtplib.send(
-            msg,
-            hostname=smtp_server,
-            port=smtp_port,
-            username=login,
-            password=password,
-            use_tls=True
-        )
-        return {"status": "success", "message": "Email sent successfully"}
-    except Exception as e:
-        return {"status": "error", "message": f"Ошибка отправки email: {str(e)}"}
\ No newline at end of file
+smtp_sender = SMTPSender(
+    hostname=os.getenv('SMTP_HOST', 'smtp.mail.ru'),
+    port=int(os.getenv('SMTP_PORT', 465)),
+    password=os.getenv('ADMIN_MAIL_PASSWORD'),
+    use_tls=os.getenv('SMTP_USE_TLS', 'true').lower() == 'true',
+    timeout=float(os.getenv('SMTP_TIMEOUT', 30)),
+)
\ No newline at end of file
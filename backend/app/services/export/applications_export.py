@@ -0,0 +1,102 @@
+from datetime import datetime
+import asyncio
+import csv
+import io
+import os
+import tempfile
+
+import xlsxwriter
+
+from db.db import SessionLocal
+from crud.applicationCRUD import applicationcrud
+from schemas.applicationSchema import ApplicationFilterSchema
+
+
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 2000))
+EXPORT_CSV_DELIMITER = os.getenv('EXPORT_CSV_DELIMITER', ';')
+
+# ячейки, которые Excel выполнит как формулу (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+EXPORT_COLUMNS = ('ID', 'Дата подачи', 'Статус', 'ФИО', 'Email', 'Телефон', 'Опыт', 'ID вакансии', 'Вакансия')
+
+
+def export_filename(extension: str) -> str:
+    return f"applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def csv_safe(value: str | None) -> str:
+    if not value:
+        return ''
+    return f"'{value}" if value.startswith(FORMULA_PREFIXES) else value
+
+
+async def stream_csv(filters: ApplicationFilterSchema):
+    # своя сессия: генератор работает уже после выхода из зависимостей запроса
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=EXPORT_CSV_DELIMITER)
+    # BOM, чтобы Excel открыл кириллицу в UTF-8
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+
+    async with SessionLocal() as db:
+        async for rows in applicationcrud.stream_export(db, filters, EXPORT_BATCH_SIZE):
+            for row in rows:
+                writer.writerow((
+                    row.id,
+                    row.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    csv_safe(row.status),
+                    csv_safe(row.fio),
+                    csv_safe(row.email),
+                    csv_safe(row.phone),
+                    csv_safe(row.experience),
+                    row.job_id,
+                    csv_safe(row.title)
+                ))
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _write_rows(worksheet, rows, start_row: int, date_format):
+    for offset, row in enumerate(rows):
+        row_number = start_row + offset
+        worksheet.write_number(row_number, 0, row.id)
+        worksheet.write_datetime(row_number, 1, row.created_at, date_format)
+        worksheet.write_string(row_number, 2, row.status)
+        worksheet.write_string(row_number, 3, row.fio)
+        worksheet.write_string(row_number, 4, row.email)
+        worksheet.write_string(row_number, 5, row.phone)
+        worksheet.write_string(row_number, 6, row.experience or '')
+        worksheet.write_number(row_number, 7, row.job_id)
+        worksheet.write_string(row_number, 8, row.title or '')
+
+
+async def build_xlsx(filters: ApplicationFilterSchema) -> str:
+    # xlsx - zip с оглавлением в конце, поэтому файл собирается на диске
+    # построчно (constant_memory) и потом отдаётся с диска частями
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet('Заявки')
+        header_format = workbook.add_format({'bold': True})
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        worksheet.write_row(0, 0, EXPORT_COLUMNS, header_format)
+        worksheet.set_column(1, 1, 20)
+        worksheet.set_column(3, 4, 30)
+
+        row_number = 1
+        async with SessionLocal() as db:
+            async for rows in applicationcrud.stream_export(db, filters, EXPORT_BATCH_SIZE):
+                await asyncio.to_thread(_write_rows, worksheet, rows, row_number, date_format)
+                row_number += len(rows)
+
+        await asyncio.to_thread(workbook.close)
+        return path
+    except BaseException:
+        os.remove(path)
+        raise
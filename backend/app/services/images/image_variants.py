@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import multiprocessing
+import asyncio
+import os
+
+from PIL import Image, ImageOps
+
+
+THUMBNAIL_SIZE = int(os.getenv('IMAGE_THUMBNAIL_SIZE', 400))
+WEBP_MAX_SIZE = int(os.getenv('IMAGE_WEBP_MAX_SIZE', 1600))
+WEBP_QUALITY = int(os.getenv('IMAGE_WEBP_QUALITY', 80))
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', os.cpu_count() or 1))
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _to_webp(image: Image.Image, max_size: int) -> bytes:
+    image = image.copy()
+    image.thumbnail((max_size, max_size))
+    buffer = BytesIO()
+    image.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def make_variants(data: bytes) -> dict[str, bytes]:
+    # выполняется в отдельном процессе: декодирование и сжатие не занимают event loop
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        return {
+            'thumbnail': _to_webp(image, THUMBNAIL_SIZE),
+            'webp': _to_webp(image, WEBP_MAX_SIZE),
+        }
+
+
+def start_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+async def generate_variants(data: bytes) -> dict[str, bytes]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(start_pool(), make_variants, data)
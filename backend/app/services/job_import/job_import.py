@@ -0,0 +1,125 @@
+from datetime import datetime
+from pydantic import ValidationError
+import asyncio
+import codecs
+import csv
+import json
+import os
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.jobCRUD import jobcrud
+from schemas.jobSchema import JobImportSchema
+
+
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))
+IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))
+# в CSV несколько фото перечисляются в одной ячейке через разделитель
+IMPORT_PHOTO_SEPARATOR = os.getenv('IMPORT_PHOTO_SEPARATOR', '|')
+
+
+def detect_format(filename: str | None, content_type: str | None) -> str | None:
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or content_type in ('application/x-ndjson', 'application/jsonl'):
+        return 'ndjson'
+    if name.endswith('.csv') or content_type == 'text/csv':
+        return 'csv'
+    return None
+
+
+def iter_lines(file):
+    # файл читается потоком из SpooledTemporaryFile, BOM от Excel отбрасывается
+    return codecs.iterdecode(file, 'utf-8-sig')
+
+
+def csv_delimiter(file) -> str:
+    header = file.readline().decode('utf-8-sig', errors='ignore')
+    file.seek(0)
+    return ';' if header.count(';') > header.count(',') else ','
+
+
+def iter_csv(file):
+    delimiter = csv_delimiter(file)
+    reader = csv.DictReader(iter_lines(file), delimiter=delimiter)
+    for row in reader:
+        data = {key: value if value != '' else None for key, value in row.items() if key}
+        photos = data.pop('photos', None)
+        data['photos'] = [url.strip() for url in photos.split(IMPORT_PHOTO_SEPARATOR) if url.strip()] if photos else []
+        yield reader.line_num, data
+
+
+def iter_ndjson(file):
+    for line_number, line in enumerate(iter_lines(file), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, e
+
+
+def format_errors(error) -> list[dict]:
+    if isinstance(error, ValidationError):
+        return [
+            {'field': '.'.join(str(part) for part in item['loc']) or None, 'message': item['msg']}
+            for item in error.errors(include_url=False)
+        ]
+    if isinstance(error, json.JSONDecodeError):
+        return [{'field': None, 'message': f'Некорректный JSON: {error.msg}'}]
+    return [{'field': None, 'message': str(error)}]
+
+
+def read_batch(rows, size: int) -> tuple[list[JobImportSchema], list[dict], int]:
+    # чтение файла и валидация идут в потоке, чтобы большой каталог не блокировал event loop
+    valid: list[JobImportSchema] = []
+    invalid: list[dict] = []
+    count = 0
+    for line_number, data in rows:
+        count += 1
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if not isinstance(data, dict):
+                raise ValueError('Строка должна быть JSON объектом')
+            valid.append(JobImportSchema.model_validate(data))
+        except (ValidationError, ValueError) as e:
+            invalid.append({'line': line_number, 'errors': format_errors(e)})
+        if count >= size:
+            break
+    return valid, invalid, count
+
+
+async def import_jobs(db: AsyncSession, file, format: str, atomic: bool = False) -> dict:
+    rows = iter_csv(file) if format == 'csv' else iter_ndjson(file)
+    created_at = datetime.now()
+
+    total = 0
+    imported = 0
+    failed = 0
+    errors = []
+
+    while True:
+        batch, invalid, count = await asyncio.to_thread(read_batch, rows, IMPORT_BATCH_SIZE)
+        if not count:
+            break
+
+        total += count
+        failed += len(invalid)
+        errors.extend(invalid[:max(IMPORT_MAX_ERRORS - len(errors), 0)])
+        # в режиме atomic после первой ошибки дальше только валидируем, импорт всё равно откатится
+        if batch and not (atomic and failed):
+            imported += len(await jobcrud.bulk_insert(db, batch, created_at))
+
+    if failed and atomic:
+        await db.rollback()
+        imported = 0
+    else:
+        await db.commit()
+
+    return {
+        'total': total,
+        'imported': imported,
+        'failed': failed,
+        'errors': errors,
+        'errors_truncated': failed > len(errors),
+    }
@@ -0,0 +1,81 @@
+from fastapi import UploadFile
+from pathlib import Path
+from uuid import uuid4
+import asyncio
+import logging
+import os
+
+from services.s3.s3_interaction import s3_client, UploadTooLargeError, MIN_PART_SIZE
+from services.images.image_variants import generate_variants
+
+
+UPLOAD_CONCURRENCY = int(os.getenv('UPLOAD_CONCURRENCY', 4))
+UPLOAD_MAX_FILES = int(os.getenv('UPLOAD_MAX_FILES', 20))
+UPLOAD_MAX_FILE_SIZE = int(os.getenv('UPLOAD_MAX_FILE_SIZE', 10 * 1024 * 1024))
+UPLOAD_PART_SIZE = int(os.getenv('UPLOAD_PART_SIZE', MIN_PART_SIZE))
+
+# общий на процесс: память ограничена UPLOAD_CONCURRENCY * UPLOAD_PART_SIZE при любом числе запросов
+_upload_semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+logger = logging.getLogger(__name__)
+
+
+def _error(file: UploadFile, message: str):
+    return {'filename': file.filename, 'status': 'error', 'error': message}
+
+
+async def upload_image(file: UploadFile) -> dict:
+    if not (file.content_type or '').startswith('image/'):
+        return _error(file, 'Файл не является изображением')
+    if file.size is not None and file.size > UPLOAD_MAX_FILE_SIZE:
+        return _error(file, f'Размер файла превышает {UPLOAD_MAX_FILE_SIZE} байт')
+
+    name = f"jobs/{uuid4()}"
+    key = f"{name}{Path(file.filename or '').suffix}"
+    async with _upload_semaphore:
+        try:
+            size = await s3_client.upload_stream(
+                key,
+                file,
+                file.content_type,
+                part_size=UPLOAD_PART_SIZE,
+                max_size=UPLOAD_MAX_FILE_SIZE
+            )
+        except UploadTooLargeError:
+            return _error(file, f'Размер файла превышает {UPLOAD_MAX_FILE_SIZE} байт')
+        except Exception as e:
+            return _error(file, f'Ошибка загрузки: {str(e)}')
+
+        variant_urls = await upload_variants(file, name)
+
+    return {
+        'filename': file.filename,
+        'status': 'ok',
+        'key': key,
+        'url': s3_client.object_url(key),
+        'size': size,
+        **variant_urls,
+    }
+
+
+async def upload_variants(file: UploadFile, name: str) -> dict:
+    # оригинал не больше UPLOAD_MAX_FILE_SIZE, поэтому читается целиком внутри семафора
+    urls = {'thumbnail_url': None, 'webp_url': None}
+    try:
+        await file.seek(0)
+        variants = await generate_variants(await file.read())
+        thumbnail_key = f"{name}_thumb.webp"
+        webp_key = f"{name}_full.webp"
+        await asyncio.gather(
+            s3_client.upload_content(thumbnail_key, variants['thumbnail'], 'image/webp'),
+            s3_client.upload_content(webp_key, variants['webp'], 'image/webp'),
+        )
+        urls['thumbnail_url'] = s3_client.object_url(thumbnail_key)
+        urls['webp_url'] = s3_client.object_url(webp_key)
+    except Exception as e:
+        logger.warning('Не удалось создать превью для %s: %s', file.filename, e)
+    return urls
+
+
+async def upload_images(files: list[UploadFile]) -> list[dict]:
+    return await asyncio.gather(*(upload_image(file) for file in files))
@@ -1,29 +1,70 @@
 from aiobotocore.session import get_session
-from contextlib import asynccontextmanager
+from aiobotocore.config import AioConfig
+from contextlib import asynccontextmanager, AsyncExitStack
+from core.metrics import instrument_botocore
 import aiofiles
 import asyncio
 import os 
 
 
+MIN_PART_SIZE = 5 * 1024 * 1024
+DELETE_BATCH_SIZE = 1000
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
 class S3Client():
     def __init__(
             self,
             accsess_key: str,
             secret_accsess_key: str,
             endpoint_url: str,
-            bucket_name: str):
+            bucket_name: str,
+            max_pool_connections: int = 50,
+            max_attempts: int = 3,
+            connect_timeout: float = 5,
+            read_timeout: float = 60):
         self.config = {
             'aws_access_key_id': accsess_key,
             'aws_secret_access_key': secret_accsess_key,
             'endpoint_url': endpoint_url,
         }   
+        self.client_config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            retries={'max_attempts': max_attempts, 'mode': 'standard'},
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
         self.bucket_name = bucket_name
         self.session = get_session()
+        self._client = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._lock:
+            if self._client is None:
+                self._exit_stack = AsyncExitStack()
+                self._client = await self._exit_stack.enter_async_context(
+                    self.session.create_client('s3', config=self.client_config, **self.config)
+                )
+                instrument_botocore(self._client, 's3')
+        return self._client
+
+    async def close(self):
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._client = None
+            self._exit_stack = None
 
     @asynccontextmanager
     async def get_client(self):
-        async with self.session.create_client('s3', **self.config) as client:
-            yield client
+        # один клиент и пул соединений на весь процесс; создаётся в lifespan
+        client = self._client or await self.start()
+        yield client
 
     async def upload_content(self, key: str, content: bytes, content_type: str = None):
         async with self.get_client() as client:
@@ -34,11 +75,82 @@ class S3Client():
                 ContentType=content_type
             )
     
+    async def upload_stream(
+            self,
+            key: str,
+            stream,
+            content_type: str = None,
+            part_size: int = MIN_PART_SIZE,
+            max_size: int | None = None):
+        # читает файл частями и отправляет multipart upload, в памяти не больше одной части
+        part_size = max(part_size, MIN_PART_SIZE)
+        content_type = content_type or 'application/octet-stream'
+
+        async with self.get_client() as client:
+            chunk = await stream.read(part_size)
+            if max_size is not None and len(chunk) > max_size:
+                raise UploadTooLargeError(key)
+
+            if len(chunk) < part_size:
+                await client.put_object(Bucket=self.bucket_name, Key=key, Body=chunk, ContentType=content_type)
+                return len(chunk)
+
+            upload = await client.create_multipart_upload(Bucket=self.bucket_name, Key=key, ContentType=content_type)
+            upload_id = upload['UploadId']
+            parts = []
+            total = 0
+            try:
+                while chunk:
+                    total += len(chunk)
+                    if max_size is not None and total > max_size:
+                        raise UploadTooLargeError(key)
+
+                    part = await client.upload_part(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=len(parts) + 1,
+                        Body=chunk
+                    )
+                    parts.append({'ETag': part['ETag'], 'PartNumber': len(parts) + 1})
+                    chunk = await stream.read(part_size)
+
+                await client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts}
+                )
+            except BaseException:
+                await client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+                raise
+
+            return total
+
+    def object_url(self, key: str) -> str:
+        return f"{self.config['endpoint_url'].rstrip('/')}/{self.bucket_name}/{key}"
+    
     async def delete_files(self, files: list[str]):
+        # DeleteObjects принимает до 1000 ключей за запрос
         async with self.get_client() as client:
-            async def delete(file: str):
-                await client.delete_object(Bucket=self.bucket_name, Key=file)
-            await asyncio.gather(*(delete(file) for file in files))
+            async def delete(batch: list[str]):
+                try:
+                    response = await client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                    )
+                except Exception as e:
+                    return [{'key': key, 'code': type(e).__name__, 'message': str(e)} for key in batch]
+                return [
+                    {'key': error.get('Key'), 'code': error.get('Code'), 'message': error.get('Message')}
+                    for error in response.get('Errors', [])
+                ]
+
+            batches = [files[i:i + DELETE_BATCH_SIZE] for i in range(0, len(files), DELETE_BATCH_SIZE)]
+            results = await asyncio.gather(*(delete(batch) for batch in batches))
+
+        errors = [error for batch_errors in results for error in batch_errors]
+        return {'deleted': len(files) - len(errors), 'errors': errors}
 
 
 s3_client = S3Client(
@@ -46,4 +158,8 @@ s3_client = S3Client(
     secret_accsess_key=os.getenv('SECRET_ACCSESS_KEY'),
     endpoint_url=os.getenv('ENDPOINT_URL'),
     bucket_name=os.getenv('BUCKET_NAME'),
+    max_pool_connections=int(os.getenv('S3_MAX_POOL_CONNECTIONS', 50)),
+    max_attempts=int(os.getenv('S3_MAX_ATTEMPTS', 3)),
+    connect_timeout=float(os.getenv('S3_CONNECT_TIMEOUT', 5)),
+    read_timeout=float(os.getenv('S3_READ_TIMEOUT', 60)),
 )
\ No newline at end of file
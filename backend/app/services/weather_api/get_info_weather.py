@@ -1,15 +1,108 @@
 import httpx
+import asyncio
 import os
 from dotenv import load_dotenv 
 
+from utils.cache import TTLCache, MISSING
+from core.metrics import track_upstream
+
 
 load_dotenv()
-async def get_weather(coordinates):
-    api = os.getenv('API_KEY')
-    url = f'http://api.weatherapi.com/v1/current.json?key={api}&q={coordinates}&aqi=no'
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        if response.status_code==200:
-            return response.json()
-        return {'Error: ', response.status_code}
 
+
+class WeatherAPIError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class WeatherClient():
+    def __init__(
+            self,
+            api_key: str,
+            base_url: str,
+            ttl: float = 600,
+            precision: int = 2,
+            timeout: float = 5,
+            max_connections: int = 20,
+            transport: httpx.AsyncBaseTransport | None = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.precision = precision
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.transport = transport
+        self.cache = TTLCache(maxsize=1024, ttl=ttl)
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[tuple[float, float], asyncio.Task] = {}
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                transport=self.transport,
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_weather(self, latitude: float, longitude: float):
+        # соседние координаты попадают в одну ячейку кэша
+        key = (round(latitude, self.precision), round(longitude, self.precision))
+        data = self.cache.get(key)
+        if data is not MISSING:
+            return data
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # отмена одного запроса не должна отменять общий запрос к API
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch(self, key: tuple[float, float]):
+        await self.start()
+        async with track_upstream('weather', 'current'):
+            try:
+                response = await self._client.get(
+                    '/v1/current.json',
+                    params={'key': self.api_key, 'q': f'{key[0]},{key[1]}', 'aqi': 'no'}
+                )
+            except httpx.TimeoutException as e:
+                raise WeatherAPIError(504, 'Сервис погоды не ответил вовремя') from e
+            except httpx.HTTPError as e:
+                raise WeatherAPIError(502, f'Сервис погоды недоступен: {str(e)}') from e
+
+            if response.status_code != 200:
+                raise WeatherAPIError(502, f'Сервис погоды вернул статус {response.status_code}')
+
+            try:
+                data = response.json()
+            except ValueError as e:
+                raise WeatherAPIError(502, 'Сервис погоды вернул некорректный ответ') from e
+
+        self.cache.set(key, data)
+        return data
+
+
+weather_client = WeatherClient(
+    api_key=os.getenv('API_KEY'),
+    base_url=os.getenv('WEATHER_API_URL', 'https://api.weatherapi.com'),
+    ttl=float(os.getenv('WEATHER_CACHE_TTL', 600)),
+    precision=int(os.getenv('WEATHER_COORD_PRECISION', 2)),
+    timeout=float(os.getenv('WEATHER_TIMEOUT', 5)),
+    max_connections=int(os.getenv('WEATHER_MAX_CONNECTIONS', 20)),
+)
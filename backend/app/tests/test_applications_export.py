@@ -0,0 +1,14 @@
+from services.export.applications_export import csv_safe
+
+
+def test_formula_cells_are_prefixed():
+    assert csv_safe('=HYPERLINK("http://x")') == '\'=HYPERLINK("http://x")'
+    assert csv_safe('+375291234567') == "'+375291234567"
+    assert csv_safe('-2+3') == "'-2+3"
+    assert csv_safe('@SUM(A1)') == "'@SUM(A1)"
+
+
+def test_plain_and_empty_cells_are_unchanged():
+    assert csv_safe('Опыт работы 3 года') == 'Опыт работы 3 года'
+    assert csv_safe(None) == ''
+    assert csv_safe('') == ''
@@ -0,0 +1,39 @@
+import pytest
+
+from utils import static_assets
+from utils.static_assets import PrecompressedStaticFiles, rewrite_asset_urls
+
+
+@pytest.fixture
+def mounts(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_assets, 'asset_manifests', {})
+    for name, css in (('public', 'body { color: red; }'), ('admin', 'body { color: blue; }')):
+        (tmp_path / name / 'css').mkdir(parents=True)
+        (tmp_path / name / 'css' / 'style.css').write_text(css)
+
+    public = PrecompressedStaticFiles(directory=str(tmp_path / 'public'), mount_path='/static')
+    admin = PrecompressedStaticFiles(directory=str(tmp_path / 'admin'), mount_path='/admin/static')
+    return public.manifest['css/style.css'], admin.manifest['css/style.css']
+
+
+def test_overlapping_paths_use_their_own_mount(mounts):
+    public_css, admin_css = mounts
+    assert public_css != admin_css
+
+    html = rewrite_asset_urls(
+        '<link href="/static/css/style.css">'
+        '<link href="/admin/static/css/style.css">'
+    )
+
+    assert html == (
+        f'<link href="/static/{public_css}">'
+        f'<link href="/admin/static/{admin_css}">'
+    )
+
+
+def test_unknown_and_external_urls_are_unchanged(mounts):
+    html = (
+        '<link href="/admin/static/css/missing.css">'
+        '<script src="https://cdn.example/static/css/style.css"></script>'
+    )
+    assert rewrite_asset_urls(html) == html
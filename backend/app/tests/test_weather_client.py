@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.weather_api.get_info_weather import WeatherClient, WeatherAPIError
+
+
+WEATHER = {'location': {'name': 'Minsk'}, 'current': {'temp_c': 12.0}}
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+def make_client(handler) -> WeatherClient:
+    return WeatherClient(
+        api_key='test-key',
+        base_url='http://weather.test',
+        precision=2,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.anyio
+async def test_cache_hit_within_coordinate_bucket():
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.params['q'])
+        return httpx.Response(200, json=WEATHER)
+
+    client = make_client(handler)
+    try:
+        first = await client.get_weather(53.9012, 27.5589)
+        second = await client.get_weather(53.8991, 27.5611)
+    finally:
+        await client.close()
+
+    assert first == second == WEATHER
+    assert calls == ['53.9,27.56']
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_lookups_share_one_upstream_call():
+    calls = 0
+
+    async def handler(request: httpx.Request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=WEATHER)
+
+    client = make_client(handler)
+    try:
+        results = await asyncio.gather(*(client.get_weather(53.9, 27.56) for _ in range(5)))
+    finally:
+        await client.close()
+
+    assert results == [WEATHER] * 5
+    assert calls == 1
+
+
+@pytest.mark.anyio
+async def test_non_200_upstream_maps_to_502():
+    client = make_client(lambda request: httpx.Response(503, text='unavailable'))
+    try:
+        with pytest.raises(WeatherAPIError) as error:
+            await client.get_weather(53.9, 27.56)
+    finally:
+        await client.close()
+
+    assert error.value.status_code == 502
+
+
+@pytest.mark.anyio
+async def test_timeout_maps_to_504():
+    def handler(request: httpx.Request):
+        raise httpx.ReadTimeout('timed out', request=request)
+
+    client = make_client(handler)
+    try:
+        with pytest.raises(WeatherAPIError) as error:
+            await client.get_weather(53.9, 27.56)
+    finally:
+        await client.close()
+
+    assert error.value.status_code == 504
+
+
+@pytest.mark.anyio
+async def test_non_json_body_maps_to_502():
+    client = make_client(lambda request: httpx.Response(200, text='<html>maintenance</html>'))
+    try:
+        with pytest.raises(WeatherAPIError) as error:
+            await client.get_weather(53.9, 27.56)
+    finally:
+        await client.close()
+
+    assert error.value.status_code == 502
+
+
+@pytest.mark.anyio
+async def test_failed_lookup_is_not_cached():
+    responses = [httpx.Response(500), httpx.Response(200, json=WEATHER)]
+
+    client = make_client(lambda request: responses.pop(0))
+    try:
+        with pytest.raises(WeatherAPIError):
+            await client.get_weather(53.9, 27.56)
+        assert await client.get_weather(53.9, 27.56) == WEATHER
+    finally:
+        await client.close()
@@ -0,0 +1,27 @@
+from fastapi import Request, Response
+import hashlib
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def with_etag(body: bytes) -> tuple[bytes, str]:
+    return body, make_etag(body)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match сравнивается слабо (RFC 9110), поэтому префикс W/ отбрасывается
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (value.strip().removeprefix('W/') for value in if_none_match.split(','))
+    return etag in candidates
+
+
+def conditional_json_response(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='application/json', headers=headers)
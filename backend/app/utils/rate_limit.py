@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+import math
+import os
+import time
+
+
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 100_000))
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+class Limit():
+    def __init__(self, rate: float, capacity: int):
+        # rate - токенов в секунду, capacity - размер бакета (допустимый всплеск)
+        self.rate = rate
+        self.capacity = capacity
+
+    @classmethod
+    def parse(cls, value: str, burst: int | None = None) -> 'Limit':
+        # формат "10/minute"; без burst бакет вмещает весь лимит периода
+        count, _, period = value.partition('/')
+        count = int(count)
+        if period not in PERIODS or count <= 0:
+            raise ValueError(f'Некорректный лимит: {value}')
+        return cls(count / PERIODS[period], burst or count)
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        # Списывает по токену из каждого бакета либо не списывает ничего.
+        # Возвращает 0, если запрос разрешён, иначе сколько секунд ждать.
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def _tokens(self, key: str, limit: Limit, now: float) -> float:
+        state = self._buckets.get(key)
+        if state is None:
+            return limit.capacity
+        tokens, updated = state
+        return min(limit.capacity, tokens + (now - updated) * limit.rate)
+
+    async def acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        # без await внутри - проверка и списание атомарны в рамках event loop
+        now = self.clock()
+        current = [(key, limit, self._tokens(key, limit, now)) for key, limit in buckets]
+
+        retry_after = max(
+            ((1 - tokens) / limit.rate for _, limit, tokens in current if tokens < 1),
+            default=0
+        )
+        if retry_after > 0:
+            return retry_after
+
+        for key, _, tokens in current:
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0
+
+
+class RateLimiter():
+    def __init__(self, scope: str, backend: RateLimitBackend, ip_limit: Limit | None, job_limit: Limit | None):
+        self.scope = scope
+        self.backend = backend
+        self.ip_limit = ip_limit
+        self.job_limit = job_limit
+
+    async def __call__(self, request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        buckets = []
+        if self.ip_limit is not None:
+            client_ip = request.client.host if request.client else 'unknown'
+            buckets.append((f'{self.scope}:ip:{client_ip}', self.ip_limit))
+        job_id = request.path_params.get('job_id')
+        if self.job_limit is not None and job_id is not None:
+            buckets.append((f'{self.scope}:job:{job_id}', self.job_limit))
+
+        retry_after = await self.backend.acquire(buckets)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail='Слишком много заявок, попробуйте позже',
+                headers={'Retry-After': str(math.ceil(retry_after))}
+            )
+
+
+rate_limit_backend = MemoryRateLimitBackend()
+
+apply_rate_limiter = RateLimiter(
+    'apply',
+    rate_limit_backend,
+    Limit.parse(os.getenv('APPLY_RATE_LIMIT_IP', '5/minute'), int(os.getenv('APPLY_RATE_BURST_IP', 0)) or None),
+    Limit.parse(os.getenv('APPLY_RATE_LIMIT_JOB', '60/minute'), int(os.getenv('APPLY_RATE_BURST_JOB', 0)) or None)
+)
@@ -0,0 +1,6 @@
+from pydantic import TypeAdapter
+
+
+def render_json(adapter: TypeAdapter, value) -> bytes:
+    # валидация по схеме ответа и сериализация в pydantic-core, без jsonable_encoder
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
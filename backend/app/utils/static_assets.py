@@ -0,0 +1,159 @@
+from pathlib import Path, PurePosixPath, PurePath
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response, FileResponse
+from starlette.staticfiles import StaticFiles
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from utils.http_cache import etag_matches, make_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+STATIC_PRECOMPRESS = os.getenv('STATIC_PRECOMPRESS', 'false').lower() == 'true'
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml', 'image/svg+xml')
+
+# mount_path -> {исходный путь: путь с хэшем}, заполняется при создании PrecompressedStaticFiles
+asset_manifests: dict[str, dict[str, str]] = {}
+_html_shells: dict[str, 'StaticAsset'] = {}
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        if name.strip().lower() != coding:
+            continue
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class StaticAsset():
+    def __init__(self, content: bytes | None, content_type: str, etag: str, path: Path | None = None):
+        # несжимаемые файлы (картинки, шрифты) не держим в памяти и отдаём с диска
+        self.content = content
+        self.content_type = content_type
+        self.etag = etag
+        self.path = path
+        self.encoded: dict[str, bytes] = {}
+
+        if content is not None and is_compressible(content_type):
+            if brotli is not None:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < len(content):
+                    self.encoded['br'] = compressed
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                self.encoded['gzip'] = compressed
+
+    def response(self, headers: Headers, cache_control: str) -> Response:
+        accept_encoding = headers.get('accept-encoding', '')
+        coding = next((c for c in ('br', 'gzip') if c in self.encoded and accepts_encoding(accept_encoding, c)), None)
+        etag = self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+        response_headers = {'ETag': etag, 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+
+        if etag_matches(headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=response_headers)
+        if coding is not None:
+            response_headers['Content-Encoding'] = coding
+            return Response(self.encoded[coding], media_type=self.content_type, headers=response_headers)
+        if self.content is None:
+            return FileResponse(self.path, media_type=self.content_type, headers=response_headers)
+        return Response(self.content, media_type=self.content_type, headers=response_headers)
+
+
+def fingerprinted_name(relative_path: str, digest: str) -> str:
+    path = PurePosixPath(relative_path)
+    return str(path.with_name(f'{path.stem}.{digest}{path.suffix}'))
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, *, directory: str, mount_path: str):
+        super().__init__(directory=directory)
+        self.mount_path = mount_path.rstrip('/')
+        self.assets: dict[str, tuple[StaticAsset, bool]] = {}
+        self.manifest: dict[str, str] = {}
+        self._load(Path(directory))
+        asset_manifests[self.mount_path] = self.manifest
+
+    def _load(self, root: Path):
+        for path in sorted(root.rglob('*')):
+            if not path.is_file():
+                continue
+
+            relative_path = path.relative_to(root).as_posix()
+            content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            content = path.read_bytes()
+            digest = hashlib.blake2b(content, digest_size=6).hexdigest()
+            asset = StaticAsset(
+                content if is_compressible(content_type) else None,
+                content_type,
+                make_etag(content),
+                path
+            )
+
+            hashed_path = fingerprinted_name(relative_path, digest)
+            self.assets[relative_path] = (asset, False)
+            self.assets[hashed_path] = (asset, True)
+            self.manifest[relative_path] = hashed_path
+
+    async def get_response(self, path: str, scope) -> Response:
+        if scope['method'] not in ('GET', 'HEAD'):
+            raise HTTPException(status_code=405)
+
+        entry = self.assets.get(PurePath(path).as_posix())
+        if entry is None:
+            return await super().get_response(path, scope)
+
+        asset, immutable = entry
+        cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        return asset.response(Headers(scope=scope), cache_control)
+
+
+def make_static_app(directory: str, mount_path: str) -> StaticFiles:
+    if STATIC_PRECOMPRESS:
+        return PrecompressedStaticFiles(directory=directory, mount_path=mount_path)
+    return StaticFiles(directory=directory)
+
+
+def rewrite_asset_urls(html: str) -> str:
+    # ссылки на /static/... в HTML заменяются на имена с хэшем контента.
+    # путь монтирования должен стоять в начале URL, иначе /static совпал бы внутри /admin/static
+    for mount_path, manifest in asset_manifests.items():
+        pattern = re.compile(r'(?<![\w/.-])' + re.escape(mount_path) + r'/([^"\'\s)?#>]+)')
+        html = pattern.sub(
+            lambda match: f'{mount_path}/{manifest[match.group(1)]}' if match.group(1) in manifest else match.group(0),
+            html
+        )
+    return html
+
+
+def html_shell(path: str) -> StaticAsset | None:
+    shell = _html_shells.get(path)
+    if shell is None:
+        if not os.path.exists(path):
+            return None
+        content = rewrite_asset_urls(Path(path).read_text(encoding='utf-8')).encode('utf-8')
+        shell = StaticAsset(content, 'text/html', make_etag(content))
+        _html_shells[path] = shell
+    return shell